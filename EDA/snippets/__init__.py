@@ -0,0 +1 @@
+# snippets — reusable EDA helpers shared by the notebooks in EDA/
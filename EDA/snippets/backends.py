@@ -0,0 +1,275 @@
+# backends.py — run the EDA questions on pandas or an in-process DuckDB engine
+#
+#   eda = get_backend("data/winequality-red.csv", "duckdb")
+#   eda.shape(); eda.head(); eda.describe(); eda.value_counts("quality")
+#   eda.column_health(); eda.duplicate_summary(); eda.summary()
+#
+# The DuckDB backend scans CSV/Parquet files (globs included) with vectorized,
+# multi-threaded queries and only small result frames come back into pandas,
+# so files far larger than RAM can be explored without a server.
+import os
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+try:
+    import duckdb
+except Exception:
+    duckdb = None
+
+ENGINES = ["auto", "pandas", "duckdb"]
+VALUE_COUNTS_LIMIT = 20
+
+# the characters Python's str.strip() removes, so blanks match the pandas path
+# (DuckDB's trim() only strips spaces)
+_BLANK_RE = r"[\s\x{0b}\x{1c}-\x{1f}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]*"
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _quote_str(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+# =============================================================
+# pandas backend (the notebooks' default)
+# =============================================================
+class PandasBackend:
+    name = "pandas"
+
+    def __init__(self, source: Union[str, pd.DataFrame], **read_kwargs):
+        if isinstance(source, pd.DataFrame):
+            self.df = source
+        elif str(source).endswith(".parquet") or os.path.isdir(source):
+            self.df = pd.read_parquet(source)
+        else:
+            self.df = pd.read_csv(source, **read_kwargs)
+
+    def shape(self) -> tuple:
+        return self.df.shape
+
+    def columns(self) -> List[str]:
+        return [str(c) for c in self.df.columns]
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self.df.head(n)
+
+    def describe(self) -> pd.DataFrame:
+        return self.df.describe()
+
+    def value_counts(self, column: str, limit: int = VALUE_COUNTS_LIMIT) -> pd.DataFrame:
+        vc = self.df[column].value_counts(dropna=False).head(limit)
+        return vc.rename_axis(column).reset_index(name="count")
+
+    def column_health(self, small_threshold: Optional[int] = None,
+                      high_cardinality_ratio: Optional[float] = None) -> pd.DataFrame:
+        from snippets.column_health import column_health
+        kwargs = {k: v for k, v in (("small_threshold", small_threshold),
+                                    ("high_cardinality_ratio", high_cardinality_ratio)) if v is not None}
+        return column_health(self.df, **kwargs)
+
+    def duplicate_summary(self, subset: Optional[List[str]] = None) -> Dict[str, int]:
+        from snippets.column_health import duplicate_summary
+        return duplicate_summary(self.df, subset)
+
+    def summary(self) -> pd.DataFrame:
+        from snippets.summary_sketch import ProfileSummary
+        return ProfileSummary.from_frame(self.df).to_frame()
+
+
+# =============================================================
+# DuckDB backend
+# =============================================================
+class DuckDBBackend:
+    """
+    Answers the same questions as PandasBackend with SQL over the file(s).
+
+    threads       -> DuckDB worker threads (default: all cores)
+    memory_limit  -> e.g. "4GB"; larger-than-memory operators spill to temp_directory
+    """
+    name = "duckdb"
+
+    def __init__(
+        self,
+        source: Union[str, pd.DataFrame],
+        threads: Optional[int] = None,
+        memory_limit: Optional[str] = None,
+        temp_directory: Optional[str] = None,
+    ):
+        if duckdb is None:
+            raise RuntimeError("duckdb package not installed. Run `pip install duckdb`.")
+        self.con = duckdb.connect(database=":memory:")
+        if threads:
+            self.con.execute(f"SET threads TO {int(threads)}")
+        if memory_limit:
+            self.con.execute(f"SET memory_limit = {_quote_str(memory_limit)}")
+        if temp_directory:
+            self.con.execute(f"SET temp_directory = {_quote_str(temp_directory)}")
+
+        if isinstance(source, pd.DataFrame):
+            # scanned in place through DuckDB's pandas replacement scan, no copy
+            self.con.register("eda_source", source)
+            self.relation = "eda_source"
+        elif str(source).endswith(".parquet") or os.path.isdir(source):
+            pattern = os.path.join(source, "**", "*.parquet") if os.path.isdir(source) else source
+            self.relation = f"read_parquet({_quote_str(pattern)}, hive_partitioning = true)"
+        else:
+            self.relation = f"read_csv_auto({_quote_str(source)})"
+        self._schema: Optional[pd.DataFrame] = None
+
+    def query(self, sql: str) -> pd.DataFrame:
+        """Run SQL where {src} stands for the source relation; returns a pandas frame."""
+        return self.con.execute(sql.replace("{src}", self.relation)).df()
+
+    def _scalar(self, sql: str) -> Any:
+        return self.con.execute(sql.replace("{src}", self.relation)).fetchone()[0]
+
+    def schema(self) -> pd.DataFrame:
+        if self._schema is None:
+            self._schema = self.query("DESCRIBE SELECT * FROM {src}")[["column_name", "column_type"]]
+        return self._schema
+
+    def _typed_columns(self) -> Dict[str, str]:
+        return dict(zip(self.schema()["column_name"], self.schema()["column_type"]))
+
+    @staticmethod
+    def _is_numeric(sql_type: str) -> bool:
+        t = sql_type.upper()
+        return any(t.startswith(p) for p in ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+                                              "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT",
+                                              "FLOAT", "DOUBLE", "DECIMAL", "REAL"))
+
+    # ---------- the usual first questions ----------
+    def shape(self) -> tuple:
+        return int(self._scalar("SELECT count(*) FROM {src}")), len(self.schema())
+
+    def columns(self) -> List[str]:
+        return self.schema()["column_name"].tolist()
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self.query(f"SELECT * FROM {{src}} LIMIT {int(n)}")
+
+    def describe(self) -> pd.DataFrame:
+        """pandas-style describe() of numeric columns, from a single aggregate scan."""
+        numeric = [c for c, t in self._typed_columns().items() if self._is_numeric(t)]
+        if not numeric:
+            return pd.DataFrame()
+        stats = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+        exprs = []
+        for i, c in enumerate(numeric):
+            q = _quote_ident(c)
+            exprs += [
+                f"count({q}) AS c{i}_0", f"avg({q}) AS c{i}_1", f"stddev_samp({q}) AS c{i}_2",
+                f"min({q})::DOUBLE AS c{i}_3", f"quantile_cont({q}, 0.25) AS c{i}_4",
+                f"quantile_cont({q}, 0.5) AS c{i}_5", f"quantile_cont({q}, 0.75) AS c{i}_6",
+                f"max({q})::DOUBLE AS c{i}_7",
+            ]
+        row = self.query(f"SELECT {', '.join(exprs)} FROM {{src}}").iloc[0]
+        data = {c: [float(row[f"c{i}_{k}"]) if row[f"c{i}_{k}"] is not None else float("nan")
+                    for k in range(len(stats))] for i, c in enumerate(numeric)}
+        return pd.DataFrame(data, index=stats)
+
+    def value_counts(self, column: str, limit: int = VALUE_COUNTS_LIMIT) -> pd.DataFrame:
+        q = _quote_ident(column)
+        return self.query(f"SELECT {q}, count(*) AS count FROM {{src}} GROUP BY {q} "
+                          f"ORDER BY count DESC LIMIT {int(limit)}")
+
+    # ---------- helpers shared with the pandas path ----------
+    def column_health(self, small_threshold: Optional[int] = None,
+                      high_cardinality_ratio: Optional[float] = None) -> pd.DataFrame:
+        """Same table as column_health.column_health(), computed in one SQL aggregate."""
+        from snippets.column_health import (HIGH_CARDINALITY_RATIO, SMALL_COLUMN_THRESHOLD,
+                                            add_health_flags)
+        types = self._typed_columns()
+        exprs = ["count(*) AS n_rows"]
+        text_cols: List[str] = []
+        for i, (c, t) in enumerate(types.items()):
+            q = _quote_ident(c)
+            is_text = t.upper().startswith("VARCHAR")
+            if is_text:
+                text_cols.append(c)
+            exprs += [
+                f"count({q}) AS c{i}_nn",
+                f"count(DISTINCT {q}) AS c{i}_u",
+                f"coalesce(count_if({q} = 0), 0) AS c{i}_z" if self._is_numeric(t) else f"0 AS c{i}_z",
+                f"coalesce(count_if(regexp_full_match({q}, {_quote_str(_BLANK_RE)})), 0) AS c{i}_b"
+                if is_text else f"0 AS c{i}_b",
+                # in-memory estimate: 8 bytes per fixed-width value, string bytes plus overhead for text
+                f"coalesce(sum(strlen({q}) + 49), 0) AS c{i}_m" if is_text else f"count(*) * 8 AS c{i}_m",
+            ]
+        row = self.query(f"SELECT {', '.join(exprs)} FROM {{src}}").iloc[0]
+        n_rows = int(row["n_rows"])
+        records = {}
+        for i, (c, t) in enumerate(types.items()):
+            nn = int(row[f"c{i}_nn"])
+            records[c] = {
+                "dtype": t.lower(), "non_null": nn, "null": n_rows - nn,
+                "unique": int(row[f"c{i}_u"]), "zeros": int(row[f"c{i}_z"]),
+                "blanks": int(row[f"c{i}_b"]), "memory_bytes": int(row[f"c{i}_m"]),
+            }
+        report = pd.DataFrame.from_dict(records, orient="index")
+        return add_health_flags(
+            report, text_cols,
+            SMALL_COLUMN_THRESHOLD if small_threshold is None else small_threshold,
+            HIGH_CARDINALITY_RATIO if high_cardinality_ratio is None else high_cardinality_ratio,
+        )
+
+    def duplicate_summary(self, subset: Optional[List[str]] = None) -> Dict[str, int]:
+        cols = ", ".join(_quote_ident(c) for c in subset) if subset else "*"
+        rows = int(self._scalar("SELECT count(*) FROM {src}"))
+        unique = int(self._scalar(f"SELECT count(*) FROM (SELECT DISTINCT {cols} FROM {{src}})"))
+        return {"rows": rows, "duplicate_rows": rows - unique, "unique_rows": unique}
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Same columns as summary_sketch.ProfileSummary.to_frame(), but exact: DuckDB
+        computes distinct counts and quantiles over the whole file in one scan.
+        """
+        types = self._typed_columns()
+        exprs = ["count(*) AS n_rows"]
+        for i, (c, t) in enumerate(types.items()):
+            q = _quote_ident(c)
+            exprs += [f"count({q}) AS c{i}_n", f"count(DISTINCT {q}) AS c{i}_d", f"mode({q})::VARCHAR AS c{i}_top"]
+            if self._is_numeric(t):
+                exprs += [f"avg({q}) AS c{i}_mean", f"stddev_samp({q}) AS c{i}_std",
+                          f"min({q})::DOUBLE AS c{i}_min", f"max({q})::DOUBLE AS c{i}_max",
+                          f"quantile_cont({q}, [0.25, 0.5, 0.75]) AS c{i}_q"]
+        row = self.query(f"SELECT {', '.join(exprs)} FROM {{src}}").iloc[0]
+        n_rows = int(row["n_rows"])
+        rows = {}
+        for i, (c, t) in enumerate(types.items()):
+            count = int(row[f"c{i}_n"])
+            r: Dict[str, Any] = {"kind": "numeric" if self._is_numeric(t) else "categorical", "count": count,
+                                 "nulls": n_rows - count, "distinct": int(row[f"c{i}_d"])}
+            if self._is_numeric(t) and count:
+                q = row[f"c{i}_q"]
+                r.update({"mean": row[f"c{i}_mean"], "std": row[f"c{i}_std"], "min": row[f"c{i}_min"],
+                          "25%": q[0], "50%": q[1], "75%": q[2], "max": row[f"c{i}_max"]})
+            if row[f"c{i}_top"] is not None:
+                r["top"] = row[f"c{i}_top"]
+            rows[c] = r
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def to_parquet(self, path: str) -> str:
+        """Cache the source as Parquet (streamed by DuckDB, never through pandas)."""
+        self.con.execute(f"COPY (SELECT * FROM {self.relation}) TO {_quote_str(path)} (FORMAT PARQUET)")
+        return path
+
+
+Backend = Union[PandasBackend, DuckDBBackend]
+
+
+def get_backend(source: Union[str, pd.DataFrame], engine: str = "auto", **kwargs) -> Backend:
+    """
+    engine="pandas" loads the data into a DataFrame; "duckdb" queries it in place;
+    "auto" uses DuckDB for file paths when it is installed and pandas otherwise.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Choose from {ENGINES}.")
+    if engine == "auto":
+        engine = "duckdb" if duckdb is not None and isinstance(source, str) else "pandas"
+    if engine == "duckdb":
+        return DuckDBBackend(source, **kwargs)
+    return PandasBackend(source, **kwargs)
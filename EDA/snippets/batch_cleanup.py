@@ -0,0 +1,236 @@
+# batch_cleanup.py — apply the data_cleanup.ipynb steps to many files in a process pool
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import PurePath
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (enables partitioned Parquet output in merge_outputs)
+except Exception:
+    pyarrow = None
+
+MANIFEST_NAME = "cleanup_manifest.csv"
+
+
+@dataclass
+class CleanupSpec:
+    """The knobs from data_cleanup.ipynb, bundled so they can be shipped to worker processes."""
+    column_blacklist: List[str] = field(default_factory=lambda: [
+        'Tool ID',
+        'Tool Description',
+        'Tool Area',
+    ])
+    normalize_dict: Dict[str, str] = field(default_factory=lambda: {
+        'TDS: Sig: Runtime': 'Runtime',
+    })
+    output_suffix: str = "_new"
+    dropna: bool = False            # drop rows with any missing value before saving
+
+
+def spec_hash(spec: CleanupSpec) -> str:
+    """Fingerprint of the cleanup settings; outputs made with another spec are stale."""
+    canonical = json.dumps(asdict(spec), sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:12]
+
+
+def clean_frame(df: pd.DataFrame, spec: CleanupSpec) -> pd.DataFrame:
+    """Remove blacklisted columns and normalize labels, as in the notebook cells."""
+    drop = [c for c in df.columns if c in spec.column_blacklist]
+    df = df.drop(columns=drop)
+    df = df.rename(columns={c: spec.normalize_dict[c] for c in df.columns if c in spec.normalize_dict})
+    if spec.dropna:
+        df = df.dropna()
+    return df
+
+
+def output_path_for(path: str, spec: CleanupSpec, output_dir: Optional[str] = None) -> str:
+    p = PurePath(path)
+    dirname = output_dir or str(p.parent)
+    return os.path.join(dirname, p.stem + spec.output_suffix + p.suffix)
+
+
+def is_up_to_date(path: str, output: str) -> bool:
+    return os.path.exists(output) and os.path.getmtime(output) >= os.path.getmtime(path)
+
+
+def clean_file(
+    path: str,
+    spec: CleanupSpec,
+    output_dir: Optional[str] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Clean one file and return its manifest row. Errors are captured, not raised."""
+    output = output_path_for(path, spec, output_dir)
+    row: Dict[str, Any] = {
+        "source": path, "output": output, "status": "cleaned",
+        "rows_in": None, "cols_in": None, "rows_out": None, "cols_out": None,
+        "rows_dropped": None, "cols_dropped": None, "seconds": 0.0, "error": "",
+        "spec_hash": spec_hash(spec),
+    }
+    if not force and is_up_to_date(path, output):
+        row["status"] = "skipped"
+        return row
+
+    t0 = time.perf_counter()
+    try:
+        df = pd.read_csv(path)
+        cleaned = clean_frame(df, spec)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        cleaned.to_csv(output, index=False)
+        row.update({
+            "rows_in": df.shape[0], "cols_in": df.shape[1],
+            "rows_out": cleaned.shape[0], "cols_out": cleaned.shape[1],
+            "rows_dropped": df.shape[0] - cleaned.shape[0],
+            "cols_dropped": df.shape[1] - cleaned.shape[1],
+        })
+    except Exception as e:
+        row.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    row["seconds"] = round(time.perf_counter() - t0, 3)
+    return row
+
+
+def resolve_inputs(source: str, spec: CleanupSpec, exclude: Iterable[str] = ()) -> List[str]:
+    """
+    Expand a directory (all *.csv inside) or a glob into input files, leaving out
+    files that are themselves cleanup outputs (stem ends with the output suffix),
+    manifests, and anything at or under the `exclude` paths (manifest, merge dir).
+    """
+    pattern = os.path.join(source, "*.csv") if os.path.isdir(source) else source
+    excluded = [os.path.abspath(e) for e in exclude if e]
+
+    def _excluded(p: str) -> bool:
+        ap = os.path.abspath(p)
+        return any(ap == e or ap.startswith(e + os.sep) for e in excluded)
+
+    return sorted(
+        p for p in glob.glob(pattern)
+        if not (spec.output_suffix and PurePath(p).stem.endswith(spec.output_suffix))
+        and os.path.basename(p) != MANIFEST_NAME
+        and not _excluded(p)
+    )
+
+
+_MANIFEST_COLUMNS = [
+    "source", "output", "status", "rows_in", "cols_in", "rows_out", "cols_out",
+    "rows_dropped", "cols_dropped", "seconds", "error", "spec_hash",
+]
+_SHAPE_COLUMNS = ["rows_in", "cols_in", "rows_out", "cols_out", "rows_dropped", "cols_dropped"]
+
+
+def _previous_hashes(manifest_path: Optional[str]) -> Dict[str, str]:
+    """source -> spec_hash of the run that produced its current output."""
+    if not manifest_path or not os.path.exists(manifest_path):
+        return {}
+    try:
+        previous = pd.read_csv(manifest_path, dtype=str, keep_default_na=False)
+    except Exception:
+        return {}
+    if "spec_hash" not in previous.columns:
+        return {}
+    done = previous[previous["status"] != "error"]
+    return dict(zip(done["source"], done["spec_hash"]))
+
+
+def _carry_forward(manifest: pd.DataFrame, manifest_path: str) -> pd.DataFrame:
+    """Fill shapes of skipped files from the previous manifest at the same path."""
+    if not os.path.exists(manifest_path):
+        return manifest
+    try:
+        previous = pd.read_csv(manifest_path).set_index("source")
+    except Exception:
+        return manifest
+    skipped = manifest["status"].eq("skipped") & manifest["source"].isin(previous.index)
+    for col in _SHAPE_COLUMNS:
+        if col in previous.columns:
+            manifest.loc[skipped, col] = manifest.loc[skipped, "source"].map(previous[col]).to_numpy()
+    return manifest
+
+
+def run_batch(
+    source: str,
+    spec: Optional[CleanupSpec] = None,
+    workers: Optional[int] = None,
+    output_dir: Optional[str] = None,
+    force: bool = False,
+    manifest_path: Optional[str] = None,
+    merge_to: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Clean every file matched by `source` (directory or glob) and return the manifest.
+
+    workers       -> process pool size (None = all cores, 1 = run serially in-process)
+    force         -> re-clean files whose outputs are already newer than the input
+                     (outputs made with a different spec are always re-cleaned)
+    manifest_path -> also write the manifest as CSV (default: <output dir>/cleanup_manifest.csv)
+    merge_to      -> merge all outputs into one dataset partitioned by source file
+    """
+    spec = spec or CleanupSpec()
+    files = resolve_inputs(source, spec, exclude=[manifest_path, merge_to])
+    t0 = time.perf_counter()
+
+    if manifest_path is None and files:
+        manifest_path = os.path.join(output_dir or os.path.dirname(files[0]) or ".", MANIFEST_NAME)
+    # an output is only up to date if the same spec produced it
+    current = spec_hash(spec)
+    previous = _previous_hashes(manifest_path)
+    stale = {p: force or previous.get(p) != current for p in files}
+
+    rows: List[Dict[str, Any]] = []
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(files) <= 1:
+        rows = [clean_file(p, spec, output_dir, stale[p]) for p in files]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            futs = [pool.submit(clean_file, p, spec, output_dir, stale[p]) for p in files]
+            for fut in as_completed(futs):
+                rows.append(fut.result())
+
+    manifest = pd.DataFrame(rows, columns=_MANIFEST_COLUMNS).sort_values("source", ignore_index=True)
+
+    if manifest_path:
+        manifest = _carry_forward(manifest, manifest_path)
+        manifest.to_csv(manifest_path, index=False)
+
+    if merge_to:
+        outputs = manifest.loc[manifest["status"] != "error", "output"].tolist()
+        merge_outputs(outputs, merge_to)
+
+    counts = manifest["status"].value_counts().to_dict()
+    print(f'{len(files)} files in {time.perf_counter() - t0:.2f}s with {workers} workers: {counts}')
+    if manifest_path:
+        print(f'manifest: {manifest_path}')
+    return manifest
+
+
+def merge_outputs(outputs: List[str], merge_to: str, partition_col: str = "source_file") -> str:
+    """
+    Merge cleaned files into one dataset at `merge_to`, partitioned by source file.
+
+    With pyarrow installed this is a Hive-partitioned Parquet dataset
+    (merge_to/source_file=<stem>/...parquet) readable via pd.read_parquet(merge_to);
+    otherwise the same layout is written with one CSV per partition.
+    Files are merged one at a time, so only a single file is ever in memory, and
+    a re-run replaces each file's partition instead of appending to it.
+    """
+    os.makedirs(merge_to, exist_ok=True)
+    for path in outputs:
+        stem = PurePath(path).stem
+        part_dir = os.path.join(merge_to, f"{partition_col}={stem}")
+        shutil.rmtree(part_dir, ignore_errors=True)
+        df = pd.read_csv(path)
+        if pyarrow is not None:
+            df[partition_col] = stem
+            df.to_parquet(merge_to, partition_cols=[partition_col], index=False)
+        else:
+            os.makedirs(part_dir, exist_ok=True)
+            df.to_csv(os.path.join(part_dir, "part-0.csv"), index=False)
+    return merge_to
@@ -0,0 +1,325 @@
+# benchmark.py — time the shared EDA operations on synthetic data at 1x..1000x scale
+#
+# Run from the EDA/ directory:
+#   python -m snippets.benchmark --datasets wine-red microwave --scales 1 10 100
+#   python -m snippets.benchmark --save-baseline          # record the current numbers
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from snippets.synthetic import DATASETS, cached_csv
+
+try:
+    import resource
+except Exception:       # Windows
+    resource = None
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+SCALES = [1, 10, 100, 1000]
+BENCH_DIR = os.path.join("reports", "benchmarks")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "eda_bench_cache")
+REGRESSION_TOLERANCE = 0.25     # slower than baseline by more than this fraction -> flagged
+
+
+# =============================================================
+# Operations under test — each takes (df, csv_path, work_dir)
+# =============================================================
+def _op_read_csv(df, path, work_dir):
+    pd.read_csv(path)
+
+
+def _op_describe(df, path, work_dir):
+    df.describe(include="all")
+
+
+def _op_empty_columns_legacy(df, path, work_dir):
+    # the original notebook cell, kept as the reference point
+    for col in df.columns:
+        df.value_counts(subset=col).sum()
+
+
+def _op_column_health(df, path, work_dir):
+    from snippets.column_health import column_health
+    column_health(df)
+
+
+def _op_duplicates_legacy(df, path, work_dir):
+    df.duplicated().value_counts()
+    df.drop_duplicates().duplicated().value_counts()
+
+
+def _op_duplicate_summary(df, path, work_dir):
+    from snippets.column_health import duplicate_summary
+    duplicate_summary(df)
+
+
+def _op_duckdb_health(df, path, work_dir):
+    from snippets.backends import get_backend
+    eda = get_backend(path, "duckdb")
+    eda.column_health()
+    eda.duplicate_summary()
+
+
+def _op_dedup_out_of_core(df, path, work_dir):
+    from snippets.dedup import find_duplicates
+    find_duplicates(path, examples=False)
+
+
+def _op_cleanup(df, path, work_dir):
+    from snippets.batch_cleanup import CleanupSpec, clean_frame
+    clean_frame(df, CleanupSpec())
+
+
+def _op_dtypes(df, path, work_dir):
+    from snippets.dtypes import optimize_dtypes
+    optimize_dtypes(df)
+
+
+def _op_profile(df, path, work_dir):
+    from snippets.fast_profile import profile_report
+    profile_report(df, title="bench", output_dir=work_dir, minimal=True, workers=1)
+
+
+OPERATIONS: Dict[str, Callable[[Optional[pd.DataFrame], str, str], None]] = {
+    "read_csv": _op_read_csv,
+    "describe": _op_describe,
+    "empty_columns_legacy": _op_empty_columns_legacy,
+    "column_health": _op_column_health,
+    "duplicates_legacy": _op_duplicates_legacy,
+    "duplicate_summary": _op_duplicate_summary,
+    "dedup_out_of_core": _op_dedup_out_of_core,
+    "duckdb_health": _op_duckdb_health,
+    "cleanup": _op_cleanup,
+    "dtypes": _op_dtypes,
+    "profile": _op_profile,
+}
+_NEEDS_FRAME = set(OPERATIONS) - {"read_csv", "dedup_out_of_core", "duckdb_health"}
+
+
+# =============================================================
+# Measurement (one fresh process per case so peak RSS is not shared)
+# =============================================================
+def _current_rss_mb() -> float:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    try:
+        return _proc_status_mb("VmRSS")
+    except (OSError, KeyError):
+        return _peak_rss_mb()
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _proc_status_mb(field: str) -> float:
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise KeyError(field)
+
+
+class _OpPeakRss:
+    """
+    Peak RSS (MB) while the `with` block runs, not since the process started.
+
+    Linux: the kernel high-water mark is reset through /proc/self/clear_refs and read
+    back from VmHWM. Elsewhere a psutil thread samples RSS every few milliseconds.
+    Without either, only a rise above the earlier process peak (getrusage) is seen.
+    """
+
+    def __init__(self, interval_s: float = 0.005):
+        self.interval_s = interval_s
+        self.peak_mb = float("nan")
+        self._mode = "rusage"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "_OpPeakRss":
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+            self._mode = "vmhwm"
+        except OSError:
+            if psutil is not None:
+                self._mode = "psutil"
+                self.peak_mb = _current_rss_mb()
+                self._thread = threading.Thread(target=self._sample, daemon=True)
+                self._thread.start()
+        return self
+
+    def _sample(self) -> None:
+        proc = psutil.Process()
+        while not self._stop.wait(self.interval_s):
+            self.peak_mb = max(self.peak_mb, proc.memory_info().rss / 1024 ** 2)
+
+    def __exit__(self, *exc) -> None:
+        if self._mode == "vmhwm":
+            self.peak_mb = _proc_status_mb("VmHWM")
+        elif self._mode == "psutil":
+            self._stop.set()
+            self._thread.join()
+            self.peak_mb = max(self.peak_mb, _current_rss_mb())
+        else:
+            self.peak_mb = _peak_rss_mb()
+
+
+def _run_case(op: str, dataset: str, scale: int, cache_dir: str, repeat: int) -> Dict[str, Any]:
+    path = cached_csv(dataset, scale, cache_dir)
+    df = pd.read_csv(path) if op in _NEEDS_FRAME else None
+    rows = len(df) if df is not None else sum(1 for _ in open(path, "rb")) - 1
+    rss_before = _current_rss_mb()
+
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as work_dir, _OpPeakRss() as mem:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            OPERATIONS[op](df, path, work_dir)
+            best = min(best, time.perf_counter() - t0)
+
+    return {
+        "dataset": dataset, "scale": scale, "rows": rows, "op": op,
+        "wall_s": round(best, 4),
+        "peak_rss_mb": round(mem.peak_mb, 1),
+        "rss_before_mb": round(rss_before, 1),
+        # memory the operation itself needed on top of the loaded frame
+        "op_mem_mb": round(max(mem.peak_mb - rss_before, 0.0), 1),
+        "rows_per_s": round(rows / best) if best > 0 else None,
+    }
+
+
+def run_benchmarks(
+    datasets: List[str],
+    scales: List[int],
+    ops: List[str],
+    repeat: int = 1,
+    cache_dir: str = CACHE_DIR,
+) -> pd.DataFrame:
+    """Run every (dataset, scale, op) case in its own spawned process and collect the results."""
+    ctx = mp.get_context("spawn")
+    results: List[Dict[str, Any]] = []
+    for dataset in datasets:
+        for scale in scales:
+            cached_csv(dataset, scale, cache_dir)     # generate outside the timed processes
+            for op in ops:
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    try:
+                        row = pool.submit(_run_case, op, dataset, scale, cache_dir, repeat).result()
+                    except Exception as e:
+                        row = {"dataset": dataset, "scale": scale, "op": op, "error": f"{type(e).__name__}: {e}"}
+                results.append(row)
+                print(f'{dataset:>10} x{scale:<5} {op:<22} '
+                      f'{row.get("wall_s", float("nan")):>9.3f}s  {row.get("op_mem_mb", float("nan")):>8.1f} MB')
+    return pd.DataFrame(results)
+
+
+# =============================================================
+# Baselines
+# =============================================================
+def _case_key(row: Dict[str, Any]) -> str:
+    return f'{row["dataset"]}@x{row["scale"]}:{row["op"]}'
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def save_baseline(results: pd.DataFrame, path: str = BASELINE_FILE) -> None:
+    """Merge `results` into the baseline file; cases not re-run keep their old numbers."""
+    baseline = load_baseline(path)
+    for row in results.to_dict("records"):
+        if "wall_s" in row and pd.notna(row["wall_s"]):
+            keys = ("rows", "wall_s", "peak_rss_mb", "op_mem_mb", "rows_per_s")
+            baseline[_case_key(row)] = {k: row[k] for k in keys if k in row}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def compare(results: pd.DataFrame, baseline: Dict[str, Dict[str, Any]],
+            tolerance: float = REGRESSION_TOLERANCE) -> pd.DataFrame:
+    """Add baseline columns, a wall-time ratio and a status (new / ok / faster / REGRESSION)."""
+    out = results.copy()
+    base_wall, base_rss, status = [], [], []
+    for row in out.to_dict("records"):
+        base = baseline.get(_case_key(row))
+        if "wall_s" not in row or pd.isna(row.get("wall_s")):
+            base_wall.append(None), base_rss.append(None), status.append("error")
+            continue
+        if not base:
+            base_wall.append(None), base_rss.append(None), status.append("new")
+            continue
+        base_wall.append(base["wall_s"])
+        base_rss.append(base.get("op_mem_mb"))
+        ratio = row["wall_s"] / base["wall_s"] if base["wall_s"] else 1.0
+        status.append("REGRESSION" if ratio > 1 + tolerance else "faster" if ratio < 1 - tolerance else "ok")
+    out["baseline_wall_s"] = base_wall
+    out["baseline_op_mem_mb"] = base_rss
+    if "wall_s" in out.columns:      # missing when every case errored
+        out["ratio"] = (out["wall_s"] / pd.to_numeric(out["baseline_wall_s"])).round(2)
+    out["status"] = status
+    return out
+
+
+# =============================================================
+# CLI
+# =============================================================
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the EDA helpers on synthetic data.")
+    parser.add_argument("--datasets", nargs="+", default=DATASETS, choices=DATASETS)
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10],
+                        help=f"multiples of each sample's size (suite uses {SCALES})")
+    parser.add_argument("--ops", nargs="+", default=list(OPERATIONS), choices=list(OPERATIONS))
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case; the fastest is kept")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.datasets, args.scales, args.ops, args.repeat, args.cache_dir)
+    table = compare(results, load_baseline(args.baseline), args.tolerance)
+
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    out_csv = os.path.join(BENCH_DIR, f"results-{time.strftime('%Y%m%d-%H%M%S')}.csv")
+    table.to_csv(out_csv, index=False)
+    cols = ["dataset", "scale", "rows", "op", "wall_s", "baseline_wall_s", "ratio",
+            "op_mem_mb", "peak_rss_mb", "rows_per_s", "status", "error"]
+    print()
+    print(table[[c for c in cols if c in table.columns]].to_string(index=False))
+    print(f'\nresults: {out_csv}')
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f'baseline updated: {args.baseline}')
+    return 1 if (table["status"] == "REGRESSION").any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# column_health.py — one-pass column health report for EDA notebooks
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+SMALL_COLUMN_THRESHOLD = 10       # fewer non-null values than this -> "small" column
+HIGH_CARDINALITY_RATIO = 0.95     # unique / non-null above this -> "high cardinality"
+_DISTINCT_BLANK_RATIO = 0.05      # unique / rows up to this -> find blanks among distinct values only
+
+
+def _text_columns(df: pd.DataFrame) -> List[str]:
+    return [
+        c for c in df.columns
+        if pd.api.types.is_object_dtype(df[c]) or pd.api.types.is_string_dtype(df[c])
+    ]
+
+
+def _sorted_nunique(s: pd.Series) -> int:
+    """
+    Distinct non-null count for a numeric column via sort + adjacent compare.
+    numpy's sort is several times faster than the hash table behind Series.nunique()
+    on high-cardinality floats, which are the bulk of wide sensor logs.
+    """
+    values = s.dropna().to_numpy()
+    if values.dtype == object:
+        values = values.astype("float64")
+    if not len(values):
+        return 0
+    values = np.sort(values)
+    return int(np.count_nonzero(values[1:] != values[:-1])) + 1
+
+
+def _nunique(df: pd.DataFrame, numeric: pd.Index) -> pd.Series:
+    unique = pd.Series(0, index=df.columns, dtype="int64")
+    for col in numeric:
+        unique[col] = _sorted_nunique(df[col])
+    other = df.columns.difference(numeric, sort=False)
+    if len(other):
+        unique[other] = df[other].nunique(dropna=True).astype("int64")
+    return unique
+
+
+def _blank_counts(df: pd.DataFrame, columns: List[str], unique: pd.Series) -> pd.Series:
+    """
+    Count values that are empty or whitespace-only strings.
+    Columns holding only strings use a vectorized str.strip() once their distinct
+    values are more than a few percent of the rows, where it beats a Python loop over
+    the distinct values. Mostly-repeated columns, and object columns with any
+    non-string values (which .str cannot handle), strip only the distinct strings
+    and match them back with a hashed isin(); non-string values are never blank.
+    """
+    counts: Dict[str, int] = {}
+    for col in columns:
+        s = df[col]
+        all_strings = pd.api.types.infer_dtype(s, skipna=True) == "string"
+        if not all_strings or unique[col] <= _DISTINCT_BLANK_RATIO * len(s):
+            distinct = pd.Series(s.dropna().unique())
+            blank = [v for v in distinct[distinct.map(type).eq(str)] if not v.strip()]
+            counts[col] = int(s.isin(blank).sum()) if blank else 0
+        else:
+            counts[col] = int(s.str.strip().eq("").sum())
+    return pd.Series(counts, dtype="int64")
+
+
+def column_health(
+    df: Union[pd.DataFrame, str],
+    small_threshold: int = SMALL_COLUMN_THRESHOLD,
+    high_cardinality_ratio: float = HIGH_CARDINALITY_RATIO,
+    deep_memory: bool = True,
+    backend: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Build a per-column health table for `df`.
+
+    `df` may also be a CSV/Parquet path (or glob); with backend="duckdb" the counts
+    run as one SQL aggregate over the file instead of loading it (see backends.py).
+
+    Replaces the notebook loop that called df.value_counts(subset=col) once per
+    column. Counts are computed with frame-wide vectorized reductions, so each
+    statistic is a single pass over the data rather than a value_counts() per column.
+
+    Returned columns (one row per input column):
+      dtype, non_null, null, unique, zeros, blanks, memory_bytes,
+      empty, small, constant, high_cardinality
+    """
+    if backend is not None or not isinstance(df, pd.DataFrame):
+        from snippets.backends import get_backend
+        return get_backend(df, backend or "auto").column_health(small_threshold, high_cardinality_ratio)
+
+    n_rows = len(df)
+    non_null = df.count()
+    numeric = df.select_dtypes(include=[np.number, "bool"]).columns
+    unique = _nunique(df, numeric)
+    zeros = pd.Series(0, index=df.columns, dtype="int64")
+    if len(numeric):
+        zeros[numeric] = df[numeric].eq(0).sum().astype("int64")
+
+    blanks = pd.Series(0, index=df.columns, dtype="int64")
+    text_cols = _text_columns(df)
+    if text_cols:
+        blanks[text_cols] = _blank_counts(df, text_cols, unique)
+
+    memory = df.memory_usage(index=False, deep=deep_memory)
+
+    report = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "non_null": non_null.astype("int64"),
+        "null": (n_rows - non_null).astype("int64"),
+        "unique": unique.astype("int64"),
+        "zeros": zeros,
+        "blanks": blanks,
+        "memory_bytes": memory.astype("int64"),
+    })
+    return add_health_flags(report, text_cols, small_threshold, high_cardinality_ratio)
+
+
+def add_health_flags(
+    report: pd.DataFrame,
+    text_cols: List[str],
+    small_threshold: int = SMALL_COLUMN_THRESHOLD,
+    high_cardinality_ratio: float = HIGH_CARDINALITY_RATIO,
+) -> pd.DataFrame:
+    """Derive the empty/small/constant/high_cardinality flags from the raw counts."""
+    # a column of only blank strings is as empty as a column of NaN
+    usable = report["non_null"] - report["blanks"]
+    report["empty"] = usable.eq(0)
+    report["small"] = ~report["empty"] & usable.lt(small_threshold)
+    report["constant"] = ~report["empty"] & report["unique"].le(1)
+    ratio = report["unique"] / report["non_null"].where(report["non_null"] > 0)
+    report["high_cardinality"] = (
+        report.index.isin(text_cols)
+        & report["non_null"].ge(small_threshold)
+        & ratio.gt(high_cardinality_ratio)
+    )
+    report.index.name = "column"
+    return report
+
+
+def empty_columns(report: pd.DataFrame) -> List[str]:
+    """Columns with no usable values (all null or all blank)."""
+    return report.index[report["empty"]].tolist()
+
+
+def small_columns(report: pd.DataFrame) -> List[Dict[str, int]]:
+    """Columns with only a few usable values, as [{col: count}] like the old notebook cell."""
+    usable = report["non_null"] - report["blanks"]
+    return [{col: int(usable[col])} for col in report.index[report["small"]]]
+
+
+def duplicate_summary(
+    df: Union[pd.DataFrame, str],
+    subset: Optional[List[str]] = None,
+    backend: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Count duplicate rows without a full-frame duplicated() pass.
+
+    Rows are hashed to 64 bits first; only rows whose hash occurs more than once
+    are compared exactly, so the result is exact while the expensive multi-column
+    factorization runs on a handful of candidates. The dedup shape follows directly,
+    so there is no need to drop and re-check.
+
+    Paths and backend="duckdb" are handled as in column_health().
+    """
+    if backend is not None or not isinstance(df, pd.DataFrame):
+        from snippets.backends import get_backend
+        return get_backend(df, backend or "auto").duplicate_summary(subset)
+
+    frame = df if subset is None else df[subset]
+    hashes = pd.Series(pd.util.hash_pandas_object(frame, index=False).to_numpy())
+    candidates = hashes.duplicated(keep=False).to_numpy()
+    n_dup = 0
+    if candidates.any():
+        n_dup = int(frame[candidates].duplicated(keep="first").sum())
+    return {
+        "rows": len(df),
+        "duplicate_rows": n_dup,
+        "unique_rows": len(df) - n_dup,
+    }
+
+
+def print_health(report: pd.DataFrame) -> None:
+    """Notebook-friendly summary matching the old "empty columns" cell output."""
+    print(report.to_string())
+    print(f'Empty columns: {empty_columns(report)}')
+    print(f'Small columns: {small_columns(report)}')
+    print(f'Constant columns: {report.index[report["constant"]].tolist()}')
+    print(f'High-cardinality columns: {report.index[report["high_cardinality"]].tolist()}')
+    print(f'Total memory: {report["memory_bytes"].sum() / 1024 ** 2:.1f} MB')
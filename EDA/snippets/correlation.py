@@ -0,0 +1,272 @@
+# correlation.py — streaming, blocked Pearson/Spearman correlation for wide datasets
+#
+#   corr = correlate_csv("data/microwave/MR01D-2022.11.04-07.csv")
+#   corr.top_pairs(k=50, threshold=0.9)        # strongest pairs only, no dense matrix
+#   corr.matrix()                              # full matrix when it is small enough
+import os
+import tempfile
+import warnings
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BLOCK_SIZE = 256         # columns per block; bounds the size of each matmul's temporaries
+CHUNK_ROWS = 200_000
+MIN_PERIODS = 3          # pairs with fewer overlapping rows than this report NaN
+
+
+def _block_stats(
+    xi: np.ndarray, mi: np.ndarray, xj: np.ndarray, mj: np.ndarray,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Pairwise-complete sufficient statistics for one column block pair.
+    x* hold shifted values with missing entries set to 0, m* are 0/1 presence masks,
+    so every sum below only counts rows where both columns are present.
+    """
+    n = mi.T @ mj
+    sxy = xi.T @ xj
+    sx_ij = xi.T @ mj             # sum of x_i over rows where j is present
+    sx_ji = (mi.T @ xj).T         # sum of x_j over rows where i is present, indexed [j, i]
+    sxx_ij = (xi * xi).T @ mj
+    sxx_ji = (mi.T @ (xj * xj)).T
+    return n, sxy, sx_ij, sx_ji, sxx_ij, sxx_ji
+
+
+class StreamingCorrelation:
+    """
+    Accumulates pairwise-complete correlation statistics chunk by chunk.
+
+    Only sufficient statistics are kept (four p×p float64 arrays, 32·p² bytes), never
+    the rows themselves. Each chunk is split into column blocks and every block pair
+    is one set of matrix products; numpy's BLAS already spreads those over all cores,
+    so there is no process pool (shipping full-height blocks to workers cost far more
+    than the products). Values are shifted by a per-column reference taken from the
+    first chunk, which keeps the one-pass variance formula stable.
+    """
+
+    def __init__(self, columns: List[str], block_size: int = BLOCK_SIZE):
+        p = len(columns)
+        self.columns = list(columns)
+        self.block_size = block_size
+        self.shift: Optional[np.ndarray] = None
+        self.rows = 0
+        self.n = np.zeros((p, p))
+        self.sxy = np.zeros((p, p))
+        self.sx = np.zeros((p, p))       # sx[i, j]: sum of x_i where j present
+        self.sxx = np.zeros((p, p))
+
+    def _blocks(self) -> List[slice]:
+        p = len(self.columns)
+        return [slice(s, min(s + self.block_size, p)) for s in range(0, p, self.block_size)]
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        values = chunk[self.columns].to_numpy(dtype="float64", na_value=np.nan)
+        present = ~np.isnan(values)
+        if self.shift is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)     # all-NaN columns
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(len(self.columns))
+        x = np.where(present, values - self.shift, 0.0)
+        m = present.astype("float64")
+        self.rows += len(chunk)
+
+        blocks = self._blocks()
+        # contiguous copies once per block, so the products do not re-gather strided columns
+        xs = [np.ascontiguousarray(x[:, b]) for b in blocks]
+        ms = [np.ascontiguousarray(m[:, b]) for b in blocks]
+        for a, bi in enumerate(blocks):
+            for b in range(a, len(blocks)):
+                bj = blocks[b]
+                n, sxy, sx_ij, sx_ji, sxx_ij, sxx_ji = _block_stats(xs[a], ms[a], xs[b], ms[b])
+                self.n[bi, bj] += n
+                self.sxy[bi, bj] += sxy
+                self.sx[bi, bj] += sx_ij
+                self.sxx[bi, bj] += sxx_ij
+                if a != b:
+                    self.n[bj, bi] += n.T
+                    self.sxy[bj, bi] += sxy.T
+                    self.sx[bj, bi] += sx_ji
+                    self.sxx[bj, bi] += sxx_ji
+
+    def merge(self, other: "StreamingCorrelation") -> None:
+        """Combine statistics accumulated separately (e.g. per file) over the same columns."""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge correlations over different columns.")
+        if other.shift is None:
+            return
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        # re-express other's sums around this shift: x' = x + d with d = other.shift - self.shift
+        d = other.shift - self.shift
+        di, dj = d[:, None], d[None, :]
+        sx_ji = other.sx.T                # sum of x_j where i present, indexed [i, j]
+        self.sxy += other.sxy + dj * other.sx + di * sx_ji + di * dj * other.n
+        self.sxx += other.sxx + 2 * di * other.sx + di * di * other.n
+        self.sx += other.sx + di * other.n
+        self.n += other.n
+        self.rows += other.rows
+
+    def _block_r(self, bi: slice, bj: slice, min_periods: int) -> np.ndarray:
+        n = self.n[bi, bj]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mx = self.sx[bi, bj] / n
+            my = self.sx[bj, bi].T / n
+            cov = self.sxy[bi, bj] / n - mx * my
+            vx = self.sxx[bi, bj] / n - mx * mx
+            vy = self.sxx[bj, bi].T / n - my * my
+            r = cov / np.sqrt(vx * vy)
+        r[(n < min_periods) | (vx <= 0) | (vy <= 0)] = np.nan
+        return np.clip(r, -1.0, 1.0)
+
+    def matrix(self, min_periods: int = MIN_PERIODS) -> pd.DataFrame:
+        """Dense correlation matrix, computed block by block."""
+        p = len(self.columns)
+        out = np.empty((p, p))
+        for bi in self._blocks():
+            for bj in self._blocks():
+                out[bi, bj] = self._block_r(bi, bj, min_periods)
+        np.fill_diagonal(out, np.where(np.diag(self.n) >= min_periods, 1.0, np.nan))
+        return pd.DataFrame(out, index=self.columns, columns=self.columns)
+
+    def top_pairs(
+        self,
+        k: int = 50,
+        threshold: float = 0.0,
+        min_periods: int = MIN_PERIODS,
+    ) -> pd.DataFrame:
+        """
+        The k most strongly correlated distinct pairs with |r| >= threshold, strongest first.
+        Works block by block, so only one block of r values exists at a time.
+        """
+        best_r = np.empty(0)
+        best_i = np.empty(0, dtype="int64")
+        best_j = np.empty(0, dtype="int64")
+        blocks = self._blocks()
+        for a, bi in enumerate(blocks):
+            for bj in blocks[a:]:
+                r = self._block_r(bi, bj, min_periods)
+                ii, jj = np.meshgrid(np.arange(bi.start, bi.stop), np.arange(bj.start, bj.stop), indexing="ij")
+                keep = (jj > ii) & ~np.isnan(r) & (np.abs(r) >= threshold)
+                if not keep.any():
+                    continue
+                best_r = np.concatenate([best_r, r[keep]])
+                best_i = np.concatenate([best_i, ii[keep]])
+                best_j = np.concatenate([best_j, jj[keep]])
+                if len(best_r) > k:
+                    top = np.argpartition(-np.abs(best_r), k - 1)[:k]
+                    best_r, best_i, best_j = best_r[top], best_i[top], best_j[top]
+
+        order = np.argsort(-np.abs(best_r), kind="stable")[:k]
+        return pd.DataFrame({
+            "column_a": [self.columns[i] for i in best_i[order]],
+            "column_b": [self.columns[j] for j in best_j[order]],
+            "r": best_r[order],
+            "n": [int(self.n[i, j]) for i, j in zip(best_i[order], best_j[order])],
+        })
+
+
+# =============================================================
+# Entry points
+# =============================================================
+def _numeric_columns(df: pd.DataFrame) -> List[str]:
+    return [c for c in df.columns
+            if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+
+
+def _rank(df: pd.DataFrame) -> pd.DataFrame:
+    # average ranks over each column's non-missing values; NaN stays NaN
+    return df.rank(method="average", na_option="keep")
+
+
+def correlate(
+    df: pd.DataFrame,
+    method: str = "pearson",
+    columns: Optional[List[str]] = None,
+    block_size: int = BLOCK_SIZE,
+    chunk_rows: int = CHUNK_ROWS,
+) -> StreamingCorrelation:
+    """
+    Correlate the numeric columns of an in-memory frame in row chunks.
+    Spearman ranks each column over its non-missing values and correlates the ranks;
+    with missing values this is the global-rank approximation (ranks are not
+    recomputed on each pair's overlapping rows).
+    """
+    columns = columns or _numeric_columns(df)
+    data = df[columns]
+    if method == "spearman":
+        data = _rank(data)
+    elif method != "pearson":
+        raise ValueError(f"Unknown method '{method}' (use 'pearson' or 'spearman').")
+    acc = StreamingCorrelation(columns, block_size)
+    for start in range(0, len(data), chunk_rows):
+        acc.update(data.iloc[start:start + chunk_rows])
+    return acc
+
+
+def _csv_numeric_columns(path: str, read_kwargs: Dict) -> List[str]:
+    head = pd.read_csv(path, nrows=1000, **read_kwargs)
+    return _numeric_columns(head)
+
+
+def _rank_to_memmap(path: str, columns: List[str], block_size: int, tmp_dir: str, read_kwargs: Dict) -> np.memmap:
+    """
+    Rank a CSV column block at a time into an on-disk float32 matrix, so Spearman
+    never needs all columns in memory at once (each block is one extra file scan).
+    The matrix is sized from the rows the first block actually parsed, so quoted
+    newlines, blank lines and skiprows/nrows in `read_kwargs` cannot add phantom rows.
+    """
+    ranks = None
+    for start in range(0, len(columns), block_size):
+        block = columns[start:start + block_size]
+        frame = pd.read_csv(path, usecols=block, **read_kwargs)[block]
+        if ranks is None:
+            ranks = np.memmap(os.path.join(tmp_dir, "ranks.f32"), dtype="float32", mode="w+",
+                              shape=(len(frame), len(columns)))
+        ranks[:, start:start + len(block)] = _rank(
+            frame.apply(pd.to_numeric, errors="coerce")).to_numpy(dtype="float32")
+    ranks.flush()
+    return ranks
+
+
+def correlate_csv(
+    path: str,
+    method: str = "pearson",
+    columns: Optional[List[str]] = None,
+    block_size: int = BLOCK_SIZE,
+    chunk_rows: int = CHUNK_ROWS,
+    **read_kwargs,
+) -> StreamingCorrelation:
+    """
+    Correlate numeric columns of a CSV without loading it.
+    Pearson streams the file once in `chunk_rows` chunks. Spearman first ranks the
+    columns block by block into a temporary on-disk matrix, then streams that.
+    """
+    columns = columns or _csv_numeric_columns(path, read_kwargs)
+    acc = StreamingCorrelation(columns, block_size)
+    if method == "pearson":
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_rows, **read_kwargs):
+            acc.update(chunk[columns].apply(pd.to_numeric, errors="coerce"))
+    elif method == "spearman":
+        with tempfile.TemporaryDirectory(prefix="corr_") as tmp_dir:
+            ranks = _rank_to_memmap(path, columns, block_size, tmp_dir, read_kwargs)
+            for start in range(0, ranks.shape[0], chunk_rows):
+                acc.update(pd.DataFrame(np.asarray(ranks[start:start + chunk_rows]), columns=columns))
+            del ranks
+    else:
+        raise ValueError(f"Unknown method '{method}' (use 'pearson' or 'spearman').")
+    return acc
+
+
+def correlate_files(paths: Iterable[str], **kwargs) -> StreamingCorrelation:
+    """Pearson over several files with the same columns, by merging per-file statistics."""
+    total: Optional[StreamingCorrelation] = None
+    for path in paths:
+        part = correlate_csv(path, method="pearson", **kwargs)
+        if total is None:
+            total = part
+        else:
+            total.merge(part)
+    if total is None:
+        raise ValueError("No files to correlate.")
+    return total
@@ -0,0 +1,360 @@
+# dedup.py — out-of-core duplicate-row detection and streaming dedup via row hashing
+import glob
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 500_000             # rows read / hashed per chunk
+MEMORY_LIMIT_ROWS = 20_000_000   # hash records kept in RAM before spilling partitions to disk
+N_PARTITIONS = 64
+MAX_GROUPS = 20                  # representative duplicate groups kept in the report
+HASH_KEY_2 = "dedup-second-key"  # 16-byte key for the second half of 128-bit hashes
+
+Source = Union[str, pd.DataFrame, Sequence[str]]
+
+# hash records: 128-bit row hash (lo is zero in 64-bit mode) + global row id
+_RECORD = np.dtype([("hi", "<u8"), ("lo", "<u8"), ("row", "<i8")])
+
+
+@dataclass
+class DuplicateGroup:
+    size: int                                   # rows sharing the same content
+    first_row: int                              # global row id of the kept representative
+    members: List[int]                          # global row ids (capped) of the group
+    source: str = ""                            # file of the representative
+    source_row: int = 0                         # 0-based data row within that file
+    example: Optional[Dict[str, object]] = None
+
+
+@dataclass
+class DedupReport:
+    rows: int = 0
+    duplicate_rows: int = 0
+    groups_with_duplicates: int = 0
+    hash_bits: int = 64
+    mode: str = "exact"
+    spilled: bool = False
+    elapsed_s: float = 0.0
+    sources: List[str] = field(default_factory=list)
+    groups: List[DuplicateGroup] = field(default_factory=list)
+    output_path: Optional[str] = None
+
+    @property
+    def unique_rows(self) -> int:
+        return self.rows - self.duplicate_rows
+
+
+# =============================================================
+# Sources & chunking
+# =============================================================
+def _resolve_sources(sources: Source) -> List[Union[str, pd.DataFrame]]:
+    if isinstance(sources, pd.DataFrame):
+        return [sources]
+    if isinstance(sources, str):
+        if os.path.isdir(sources):
+            return sorted(glob.glob(os.path.join(sources, "*.csv")))
+        matches = sorted(glob.glob(sources))
+        return matches or [sources]
+    return list(sources)
+
+
+def _source_name(src: Union[str, pd.DataFrame], idx: int) -> str:
+    return src if isinstance(src, str) else f"<DataFrame {idx}>"
+
+
+def _iter_chunks(
+    sources: List[Union[str, pd.DataFrame]],
+    chunk_rows: int,
+) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """
+    Yield (source index, chunk). CSV files are read as strings so the same text
+    hashes the same way regardless of how pandas would infer each chunk's dtypes.
+    """
+    for idx, src in enumerate(sources):
+        if isinstance(src, pd.DataFrame):
+            for start in range(0, len(src), chunk_rows):
+                yield idx, src.iloc[start:start + chunk_rows]
+        else:
+            for chunk in pd.read_csv(src, chunksize=chunk_rows, dtype=str, keep_default_na=False):
+                yield idx, chunk
+
+
+# =============================================================
+# Row hashing
+# =============================================================
+def normalize_text(frame: pd.DataFrame) -> pd.DataFrame:
+    """Lower-case, trim and collapse internal whitespace in text columns (near-duplicate mode)."""
+    out = frame.copy()
+    for col in out.columns:
+        s = out[col]
+        if pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            out[col] = s.astype(str).str.strip().str.lower().str.replace(r"\s+", " ", regex=True)
+    return out
+
+
+def row_hashes(
+    frame: pd.DataFrame,
+    subset: Optional[List[str]] = None,
+    mode: str = "exact",
+    hash_bits: int = 64,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (hi, lo) uint64 arrays of per-row hashes. lo is all zeros for 64-bit hashes;
+    128-bit hashes combine two independently keyed hash_pandas_object passes.
+    """
+    if subset:
+        frame = frame[subset]
+    if mode == "normalized":
+        frame = normalize_text(frame)
+    elif mode != "exact":
+        raise ValueError(f"Unknown dedup mode '{mode}' (use 'exact' or 'normalized').")
+    hi = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    if hash_bits == 64:
+        lo = np.zeros(len(hi), dtype="uint64")
+    elif hash_bits == 128:
+        lo = pd.util.hash_pandas_object(frame, index=False, hash_key=HASH_KEY_2).to_numpy()
+    else:
+        raise ValueError("hash_bits must be 64 or 128.")
+    return hi, lo
+
+
+# =============================================================
+# Hash partitions (in memory or spilled to disk)
+# =============================================================
+class _HashStore:
+    """Collect hash records; once over the memory limit, spill them to partition files by hash."""
+
+    def __init__(self, memory_limit_rows: int, n_partitions: int, spill_dir: Optional[str]):
+        self.memory_limit_rows = memory_limit_rows
+        self.n_partitions = n_partitions
+        self.spill_root = spill_dir
+        self.spill_dir: Optional[str] = None
+        self.buffer: List[np.ndarray] = []
+        self.buffered = 0
+
+    @property
+    def spilled(self) -> bool:
+        return self.spill_dir is not None
+
+    def add(self, records: np.ndarray) -> None:
+        self.buffer.append(records)
+        self.buffered += len(records)
+        if self.buffered > self.memory_limit_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="dedup_", dir=self.spill_root)
+        records = np.concatenate(self.buffer)
+        part = (records["hi"] % np.uint64(self.n_partitions)).astype("int64")
+        order = np.argsort(part, kind="stable")
+        records, part = records[order], part[order]
+        bounds = np.searchsorted(part, np.arange(self.n_partitions + 1))
+        for p in range(self.n_partitions):
+            if bounds[p] < bounds[p + 1]:
+                with open(os.path.join(self.spill_dir, f"part_{p:04d}.bin"), "ab") as f:
+                    records[bounds[p]:bounds[p + 1]].tofile(f)
+        self.buffer, self.buffered = [], 0
+
+    def partitions(self) -> Iterator[np.ndarray]:
+        if not self.spilled:
+            if self.buffer:
+                yield np.concatenate(self.buffer)
+            return
+        if self.buffer:
+            self._flush()
+        for p in range(self.n_partitions):
+            path = os.path.join(self.spill_dir, f"part_{p:04d}.bin")
+            if os.path.exists(path):
+                yield np.fromfile(path, dtype=_RECORD)
+
+    def close(self) -> None:
+        if self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+def _scan_partition(
+    records: np.ndarray,
+    max_groups: int,
+    max_members: int = 10,
+) -> Tuple[np.ndarray, int, List[DuplicateGroup]]:
+    """Return (row ids to drop, number of duplicate groups, largest groups) for one partition."""
+    records = records[np.lexsort((records["row"], records["lo"], records["hi"]))]
+    same = (records["hi"][1:] == records["hi"][:-1]) & (records["lo"][1:] == records["lo"][:-1])
+    is_dup = np.concatenate([[False], same])
+    drop = records["row"][is_dup]
+
+    groups: List[DuplicateGroup] = []
+    n_groups = 0
+    if len(drop):
+        starts = np.flatnonzero(~is_dup)
+        sizes = np.diff(np.append(starts, len(records)))
+        starts, sizes = starts[sizes > 1], sizes[sizes > 1]
+        n_groups = len(starts)
+        for i in np.argsort(-sizes, kind="stable")[:max_groups]:
+            rows = records["row"][starts[i]:starts[i] + min(sizes[i], max_members)]
+            groups.append(DuplicateGroup(size=int(sizes[i]), first_row=int(rows[0]), members=rows.tolist()))
+    return drop, n_groups, groups
+
+
+# =============================================================
+# Public API
+# =============================================================
+def _hash_pass(
+    sources: List[Union[str, pd.DataFrame]],
+    subset: Optional[List[str]],
+    mode: str,
+    hash_bits: int,
+    chunk_rows: int,
+    memory_limit_rows: int,
+    n_partitions: int,
+    spill_dir: Optional[str],
+    max_groups: int,
+) -> Tuple[DedupReport, np.ndarray, List[int]]:
+    report = DedupReport(hash_bits=hash_bits, mode=mode,
+                         sources=[_source_name(s, i) for i, s in enumerate(sources)])
+    store = _HashStore(memory_limit_rows, n_partitions, spill_dir)
+    offsets = [0] * (len(sources) + 1)     # global row id where each source starts
+    next_row = 0
+    try:
+        for idx, chunk in _iter_chunks(sources, chunk_rows):
+            hi, lo = row_hashes(chunk, subset, mode, hash_bits)
+            records = np.empty(len(chunk), dtype=_RECORD)
+            records["hi"], records["lo"] = hi, lo
+            records["row"] = np.arange(next_row, next_row + len(chunk))
+            store.add(records)
+            next_row += len(chunk)
+            offsets[idx + 1] = next_row
+        for i in range(1, len(offsets)):
+            offsets[i] = max(offsets[i], offsets[i - 1])
+
+        drops: List[np.ndarray] = []
+        groups: List[DuplicateGroup] = []
+        for records in store.partitions():
+            drop, n_groups, part_groups = _scan_partition(records, max_groups)
+            drops.append(drop)
+            report.groups_with_duplicates += n_groups
+            groups = sorted(groups + part_groups, key=lambda g: g.size, reverse=True)[:max_groups]
+        report.spilled = store.spilled
+    finally:
+        store.close()
+
+    drop_rows = np.sort(np.concatenate(drops)) if drops else np.empty(0, dtype="int64")
+    report.rows = next_row
+    report.duplicate_rows = int(len(drop_rows))
+    report.groups = groups
+    for g in groups:
+        src = int(np.searchsorted(offsets, g.first_row, side="right")) - 1
+        g.source = report.sources[src]
+        g.source_row = g.first_row - offsets[src]
+    return report, drop_rows, offsets
+
+
+def _attach_examples(report: DedupReport, chunk_iter: Iterator[Tuple[int, pd.DataFrame]]) -> None:
+    wanted = {g.first_row: g for g in report.groups}
+    row = 0
+    for _, chunk in chunk_iter:
+        hits = [r for r in wanted if row <= r < row + len(chunk)]
+        for r in hits:
+            wanted.pop(r).example = chunk.iloc[r - row].to_dict()
+        row += len(chunk)
+        if not wanted:
+            break
+
+
+def find_duplicates(
+    sources: Source,
+    subset: Optional[List[str]] = None,
+    mode: str = "exact",
+    hash_bits: int = 64,
+    chunk_rows: int = CHUNK_ROWS,
+    memory_limit_rows: int = MEMORY_LIMIT_ROWS,
+    n_partitions: int = N_PARTITIONS,
+    spill_dir: Optional[str] = None,
+    max_groups: int = MAX_GROUPS,
+    examples: bool = True,
+) -> DedupReport:
+    """
+    Count duplicate rows across one or many sources without holding them in memory.
+
+    sources  -> a DataFrame, a CSV path, a directory of CSVs, a glob, or a list of paths;
+                rows are compared across all files, so cross-file duplicates are found
+    subset   -> only these columns define a duplicate (key-subset mode)
+    mode     -> "exact", or "normalized" to ignore case and whitespace in text columns
+    hash_bits-> 64 (collision odds ~n²/2⁶⁵, negligible below ~10⁸ rows) or 128
+
+    Only 24 bytes per row are kept; past `memory_limit_rows` they are spilled to
+    `n_partitions` files under `spill_dir` (system temp by default) and each
+    partition is resolved on its own. `examples` re-reads the sources up to the
+    last representative row to attach a sample row to each reported group.
+    """
+    t0 = time.perf_counter()
+    resolved = _resolve_sources(sources)
+    report, _, _ = _hash_pass(resolved, subset, mode, hash_bits, chunk_rows,
+                              memory_limit_rows, n_partitions, spill_dir, max_groups)
+    if examples and report.groups:
+        _attach_examples(report, _iter_chunks(resolved, chunk_rows))
+    report.elapsed_s = time.perf_counter() - t0
+    return report
+
+
+def write_deduplicated(
+    sources: Source,
+    output_path: str,
+    subset: Optional[List[str]] = None,
+    mode: str = "exact",
+    hash_bits: int = 64,
+    chunk_rows: int = CHUNK_ROWS,
+    memory_limit_rows: int = MEMORY_LIMIT_ROWS,
+    n_partitions: int = N_PARTITIONS,
+    spill_dir: Optional[str] = None,
+    max_groups: int = MAX_GROUPS,
+) -> DedupReport:
+    """
+    Stream `sources` into a single CSV at `output_path`, keeping the first
+    occurrence of every duplicate group. Arguments match find_duplicates();
+    memory stays bounded by one chunk plus the sorted array of dropped row ids.
+    """
+    t0 = time.perf_counter()
+    resolved = _resolve_sources(sources)
+    report, drop_rows, _ = _hash_pass(resolved, subset, mode, hash_bits, chunk_rows,
+                                      memory_limit_rows, n_partitions, spill_dir, max_groups)
+
+    wanted = {g.first_row: g for g in report.groups}
+    columns: Optional[List[str]] = None
+    row = 0
+    with open(output_path, "w", encoding="utf-8", newline="") as out:
+        for _, chunk in _iter_chunks(resolved, chunk_rows):
+            if columns is None:
+                columns = list(chunk.columns)
+                chunk.head(0).to_csv(out, index=False)
+            elif list(chunk.columns) != columns:
+                raise ValueError(f"Column mismatch in {report.sources}: expected {columns}, got {list(chunk.columns)}")
+            lo, hi = np.searchsorted(drop_rows, [row, row + len(chunk)])
+            keep = np.ones(len(chunk), dtype=bool)
+            keep[drop_rows[lo:hi] - row] = False
+            for r in [r for r in wanted if row <= r < row + len(chunk)]:
+                wanted.pop(r).example = chunk.iloc[r - row].to_dict()
+            chunk[keep].to_csv(out, index=False, header=False)
+            row += len(chunk)
+
+    report.output_path = output_path
+    report.elapsed_s = time.perf_counter() - t0
+    return report
+
+
+def print_report(report: DedupReport) -> None:
+    """Notebook-friendly summary of a DedupReport."""
+    print(f'rows={report.rows:,}  duplicates={report.duplicate_rows:,}  unique={report.unique_rows:,}')
+    print(f'groups with duplicates={report.groups_with_duplicates:,}  mode={report.mode}  '
+          f'hash={report.hash_bits}-bit  spilled={report.spilled}  elapsed={report.elapsed_s:.2f}s')
+    for g in report.groups:
+        print(f'  x{g.size:<6} {g.source}:{g.source_row}  {g.example if g.example is not None else ""}')
+    if report.output_path:
+        print(f'deduplicated output: {report.output_path}')
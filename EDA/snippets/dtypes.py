@@ -0,0 +1,245 @@
+# dtypes.py — compact dtype inference, memory report and reusable schemas for EDA loaders
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_RATIO = 0.5       # object column -> category when unique / non-null is at most this
+MAX_CATEGORIES = 10_000
+
+_INT_TYPES = ["int8", "int16", "int32", "int64"]
+_UINT_TYPES = ["uint8", "uint16", "uint32", "uint64"]
+
+
+@dataclass
+class MemoryReport:
+    before_bytes: int
+    after_bytes: int
+    columns: pd.DataFrame          # per column: before_dtype, after_dtype, before_bytes, after_bytes
+
+    @property
+    def ratio(self) -> float:
+        return self.before_bytes / self.after_bytes if self.after_bytes else float("inf")
+
+    def __str__(self) -> str:
+        mb = 1024 ** 2
+        return (f'memory: {self.before_bytes / mb:.2f} MB -> {self.after_bytes / mb:.2f} MB '
+                f'({self.ratio:.1f}x smaller)')
+
+
+# =============================================================
+# Inference
+# =============================================================
+def _smallest_int(vmin: float, vmax: float, nullable: bool) -> str:
+    candidates = _UINT_TYPES if vmin >= 0 else _INT_TYPES
+    for name in candidates:
+        info = np.iinfo(name)
+        if info.min <= vmin and vmax <= info.max:
+            return name.capitalize().replace("Uint", "UInt") if nullable else name
+    return "Float64" if nullable else "float64"
+
+
+def _float32_exact(values: np.ndarray) -> bool:
+    """
+    True when float32 keeps every value's decimal digits: the shortest float32 repr of
+    each value parses back to the same float64 (e.g. 0.1 and 47.25 do, 123456789.5 and
+    47.1234567 do not). Checked over distinct values, which are few for measured data.
+    """
+    values = np.unique(values[np.isfinite(values)])
+    if not len(values) or np.abs(values).max() >= np.finfo("float32").max:
+        return False
+    return bool(np.array_equal(values.astype("float32").astype(str).astype("float64"), values))
+
+
+def _infer_numeric(s: pd.Series, narrow_floats: bool) -> str:
+    if pd.api.types.is_bool_dtype(s):
+        return "boolean" if s.hasnans else "bool"
+    values = s.dropna().to_numpy(dtype="float64")
+    nullable = len(values) < len(s)
+    if not len(values):
+        return str(s.dtype)
+    if np.array_equal(values, np.floor(values)):
+        return _smallest_int(values.min(), values.max(), nullable)
+    if narrow_floats and _float32_exact(values):
+        return "float32"
+    return "float64"
+
+
+def _infer_object(s: pd.Series, category_ratio: float, max_categories: int) -> str:
+    non_null = s.dropna()
+    if not len(non_null):
+        return str(s.dtype)
+    distinct = non_null.unique()
+    if set(map(str, distinct)) <= {"True", "False", "true", "false"}:
+        return "boolean"
+    if len(distinct) <= max_categories and len(distinct) <= category_ratio * len(non_null):
+        return "category"
+    return str(s.dtype)
+
+
+def infer_schema(
+    df: pd.DataFrame,
+    category_ratio: float = CATEGORY_RATIO,
+    max_categories: int = MAX_CATEGORIES,
+    narrow_floats: bool = True,
+) -> Dict[str, str]:
+    """
+    Infer a compact dtype for every column, as {column: dtype string}.
+
+      low-cardinality text          -> category
+      whole-number numerics         -> smallest (u)int8..64, nullable Int/UInt when NaNs are present
+      floats float32 reproduces     -> float32 (same decimal digits; narrow_floats=False keeps float64)
+      True/False text or bools      -> bool / nullable boolean
+
+    The strings are valid pandas dtypes, so the schema can be passed straight to
+    read_csv(dtype=...) on later loads.
+    """
+    schema: Dict[str, str] = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+            schema[str(col)] = _infer_numeric(s, narrow_floats)
+        elif pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            schema[str(col)] = _infer_object(s, category_ratio, max_categories)
+        else:
+            schema[str(col)] = str(s.dtype)
+    return schema
+
+
+# =============================================================
+# Apply / report
+# =============================================================
+def apply_schema(df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """Cast columns listed in `schema`; columns missing from the frame are ignored."""
+    casts = {c: t for c, t in schema.items() if c in df.columns and str(df[c].dtype) != t}
+    out = df.copy()
+    for col, dtype in casts.items():
+        if dtype == "boolean" and not pd.api.types.is_bool_dtype(out[col]):
+            out[col] = out[col].map({"True": True, "true": True, True: True,
+                                     "False": False, "false": False, False: False}).astype("boolean")
+        else:
+            out[col] = out[col].astype(dtype)
+    return out
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> MemoryReport:
+    b = before.memory_usage(index=False, deep=True)
+    a = after.memory_usage(index=False, deep=True)
+    columns = pd.DataFrame({
+        "before_dtype": before.dtypes.astype(str),
+        "after_dtype": after.dtypes.astype(str),
+        "before_bytes": b,
+        "after_bytes": a,
+    })
+    return MemoryReport(before_bytes=int(b.sum()), after_bytes=int(a.sum()), columns=columns)
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    schema: Optional[Dict[str, str]] = None,
+    **infer_kwargs,
+) -> Tuple[pd.DataFrame, MemoryReport, Dict[str, str]]:
+    """
+    Return (compact frame, memory report, schema). Pass a previously inferred
+    `schema` to skip inference; infer_kwargs are forwarded to infer_schema().
+    """
+    schema = schema or infer_schema(df, **infer_kwargs)
+    compact = apply_schema(df, schema)
+    return compact, memory_report(df, compact), schema
+
+
+# =============================================================
+# Schema persistence & compact loader
+# =============================================================
+def save_schema(schema: Dict[str, str], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2, ensure_ascii=False)
+
+
+def load_schema(path: str) -> Dict[str, str]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def schema_path_for(csv_path: str) -> str:
+    """Default sidecar location: data/foo.csv -> data/foo.schema.json"""
+    root, _ = os.path.splitext(csv_path)
+    return root + ".schema.json"
+
+
+def _wide_dtype(dtype: str) -> Optional[str]:
+    """Type to parse a schema column as before checking it fits (None = parse as saved)."""
+    if dtype.lower() in _INT_TYPES[:-1] + _UINT_TYPES[:-1]:
+        return "Int64"          # exact for every narrower int, and keeps NaNs visible
+    if dtype == "float32":
+        return "float64"
+    return None
+
+
+def _fits(s: pd.Series, dtype: str) -> bool:
+    """Whether the widely-parsed column `s` can be cast to the saved `dtype` without changing values."""
+    if dtype == "float32":
+        return _float32_exact(s.dropna().to_numpy(dtype="float64"))
+    if s.hasnans and not dtype[0].isupper():
+        return False            # new NaNs in a plain int column
+    non_null = s.dropna()
+    if not len(non_null):
+        return True
+    info = np.iinfo(dtype.lower())
+    return bool(info.min <= non_null.min() and non_null.max() <= info.max)
+
+
+def read_csv_compact(
+    path: str,
+    schema_path: Optional[str] = None,
+    refresh: bool = False,
+    verbose: bool = True,
+    **read_kwargs,
+) -> pd.DataFrame:
+    """
+    Load a CSV with compact dtypes.
+
+    On the first load the schema is inferred and saved next to the file (or to
+    `schema_path`); later loads reuse it and skip inference. Narrow integer and
+    float32 columns are parsed wide, checked for range, new NaNs and precision,
+    and only then cast. If the saved schema no longer fits the data (e.g. 300 in
+    a uint8 column) it is re-inferred and overwritten. `refresh=True` forces
+    re-inference.
+    """
+    schema_path = schema_path or schema_path_for(path)
+    schema = {} if refresh else load_schema(schema_path)
+
+    if schema:
+        # narrow ints and float32 are parsed wide and only cast once the values are
+        # known to fit; a plain dtype=schema read would silently wrap 300 -> 44 in uint8
+        wide = {c: _wide_dtype(t) or t for c, t in schema.items()}
+        try:
+            df = pd.read_csv(path, dtype=wide, **read_kwargs)
+            misfits = [c for c, t in schema.items()
+                       if c in df.columns and _wide_dtype(t) and not _fits(df[c], t)]
+            if misfits:
+                raise ValueError(f"values outside the saved types in {misfits}")
+            df = df.astype({c: t for c, t in schema.items() if c in df.columns and _wide_dtype(t)})
+            if verbose:
+                mb = df.memory_usage(index=False, deep=True).sum() / 1024 ** 2
+                print(f'loaded {path} with saved schema {schema_path}: {mb:.2f} MB')
+            return df
+        except (ValueError, TypeError) as e:
+            if verbose:
+                print(f'saved schema no longer fits ({e}); re-inferring')
+
+    raw = pd.read_csv(path, **read_kwargs)
+    df, report, schema = optimize_dtypes(raw)
+    save_schema(schema, schema_path)
+    if verbose:
+        print(f'loaded {path}: {report}; schema saved to {schema_path}')
+    return df
@@ -0,0 +1,301 @@
+# fast_profile.py — lightweight HTML profiler, a quick alternative to ydata ProfileReport
+import html
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from snippets.column_health import _sorted_nunique, column_health, duplicate_summary
+from snippets.correlation import correlate
+
+HIST_BINS = 20
+TOP_VALUES = 10
+Z_95 = 1.96                 # z-score for the 95% error bounds reported on sampled runs
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    dtype: str
+    kind: str                                # "numeric" | "categorical" | "datetime" | "bool"
+    count: int
+    missing: int
+    stats: Dict[str, float] = field(default_factory=dict)
+    histogram: Optional[Dict[str, List[float]]] = None
+    top_values: List[tuple] = field(default_factory=list)
+
+
+# =============================================================
+# Per-column profiling (runs in worker processes)
+# =============================================================
+def _column_kind(s: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(s):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(s):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return "datetime"
+    return "categorical"
+
+
+def _numeric_profile(values: np.ndarray) -> tuple:
+    """
+    Moments, quantiles and a fixed-range histogram of one column. Works on a single
+    float64 copy of the column (8 bytes per row) plus its non-null subset; the frame
+    itself is already in memory, so this stays small next to it.
+    """
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
+        return {}, None
+
+    mean = float(values.mean())
+    var = float(np.square(values - mean).sum()) / max(n - 1, 1)
+    vmin, vmax = float(values.min()), float(values.max())
+    edges = np.linspace(vmin, vmax if vmax > vmin else vmin + 1, HIST_BINS + 1)
+    counts = np.histogram(values, bins=edges)[0]
+
+    q = np.percentile(values, [5, 25, 50, 75, 95])
+    stats = {
+        "mean": mean, "std": math.sqrt(var), "min": vmin, "max": vmax,
+        "p5": q[0], "p25": q[1], "median": q[2], "p75": q[3], "p95": q[4],
+        "zeros": int((values == 0).sum()),
+    }
+    hist = {"counts": counts.tolist(), "edges": edges.tolist()}
+    return stats, hist
+
+
+def _profile_column(name: str, s: pd.Series, unique: Optional[int] = None) -> ColumnProfile:
+    kind = _column_kind(s)
+    count = int(s.count())
+    prof = ColumnProfile(
+        name=str(name), dtype=str(s.dtype), kind=kind,
+        count=count, missing=int(len(s) - count),
+    )
+    if kind == "numeric":
+        prof.stats, prof.histogram = _numeric_profile(s.to_numpy(dtype="float64", na_value=np.nan))
+    elif kind == "datetime" and count:
+        prof.stats = {"min": str(s.min()), "max": str(s.max())}
+    if unique is None:
+        unique = _sorted_nunique(s) if kind in ("numeric", "bool") else int(s.nunique(dropna=True))
+    prof.stats["unique"] = unique
+    if kind != "numeric" or prof.stats["unique"] <= TOP_VALUES:
+        vc = s.value_counts(dropna=True).head(TOP_VALUES)
+        prof.top_values = [(str(k), int(v)) for k, v in vc.items()]
+    return prof
+
+
+def _profile_batch(frame: pd.DataFrame, unique: Dict[Any, int]) -> List[ColumnProfile]:
+    return [_profile_column(c, frame[c], unique.get(c)) for c in frame.columns]
+
+
+def profile_columns(
+    df: pd.DataFrame,
+    workers: Optional[int] = None,
+    unique: Optional[Dict[Any, int]] = None,
+) -> List[ColumnProfile]:
+    """
+    Profile every column. With workers > 1 the columns are split into batches and
+    handed to a process pool; workers=None uses os.cpu_count(), workers=1 stays serial.
+    Pass `unique` (e.g. from column_health) to skip recounting distinct values.
+    """
+    workers = workers or os.cpu_count() or 1
+    unique = unique or {}
+    cols = list(df.columns)
+    if workers <= 1 or len(cols) < 2:
+        return _profile_batch(df, unique)
+
+    n_batches = min(workers, len(cols))
+    batches = [cols[i::n_batches] for i in range(n_batches)]
+    by_name: Dict[str, ColumnProfile] = {}
+    with ProcessPoolExecutor(max_workers=n_batches) as pool:
+        futures = [
+            pool.submit(_profile_batch, df[b], {c: unique[c] for c in b if c in unique})
+            for b in batches
+        ]
+        for fut in futures:
+            for prof in fut.result():
+                by_name[prof.name] = prof
+    return [by_name[str(c)] for c in cols]
+
+
+# =============================================================
+# Sampling with error bounds
+# =============================================================
+def sample_rows(df: pd.DataFrame, n: Optional[int], seed: int = 0) -> pd.DataFrame:
+    if not n or len(df) <= n:
+        return df
+    return df.sample(n=n, random_state=seed)
+
+
+def error_bounds(n_sample: int, n_total: int) -> Dict[str, float]:
+    """
+    95% margins for statistics estimated from a simple random sample of n_sample rows
+    out of n_total (with finite population correction).
+
+      proportion_margin: worst-case (p=0.5) absolute error on a fraction such as
+                         missing %, zero % or a category share
+      mean_margin_in_std: error on a column mean, in units of that column's std
+    """
+    if n_sample >= n_total:
+        return {"proportion_margin": 0.0, "mean_margin_in_std": 0.0}
+    fpc = math.sqrt((n_total - n_sample) / max(n_total - 1, 1))
+    se = fpc / math.sqrt(n_sample)
+    return {
+        "proportion_margin": Z_95 * 0.5 * se,
+        "mean_margin_in_std": Z_95 * se,
+    }
+
+
+# =============================================================
+# HTML rendering
+# =============================================================
+_CSS = """
+body { font-family: -apple-system, Segoe UI, Helvetica, Arial, sans-serif; margin: 24px; color: #222; }
+h1 { margin-bottom: 4px; } h2 { border-bottom: 1px solid #ddd; padding-bottom: 4px; margin-top: 32px; }
+table { border-collapse: collapse; font-size: 13px; margin: 8px 0; }
+th, td { border: 1px solid #ddd; padding: 4px 8px; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+.col { display: flex; gap: 24px; align-items: flex-start; border: 1px solid #eee; padding: 12px; margin: 12px 0; border-radius: 6px; }
+.note { color: #666; font-size: 13px; }
+.bar { background: #4c78a8; height: 10px; }
+"""
+
+
+def _fmt(v: Any) -> str:
+    if isinstance(v, float):
+        return f"{v:,.4g}"
+    if isinstance(v, (int, np.integer)):
+        return f"{v:,}"
+    return html.escape(str(v))
+
+
+def _svg_histogram(hist: Dict[str, List[float]], width: int = 300, height: int = 100) -> str:
+    counts = hist["counts"]
+    peak = max(counts) or 1
+    bar_w = width / len(counts)
+    bars = "".join(
+        f'<rect x="{i * bar_w:.1f}" y="{height - c / peak * height:.1f}" '
+        f'width="{bar_w - 1:.1f}" height="{c / peak * height:.1f}" fill="#4c78a8"/>'
+        for i, c in enumerate(counts)
+    )
+    lo, hi = hist["edges"][0], hist["edges"][-1]
+    return (
+        f'<svg width="{width}" height="{height + 16}">{bars}'
+        f'<text x="0" y="{height + 12}" font-size="10">{_fmt(lo)}</text>'
+        f'<text x="{width}" y="{height + 12}" font-size="10" text-anchor="end">{_fmt(hi)}</text></svg>'
+    )
+
+
+def _table(rows: List[tuple], header: Optional[tuple] = None) -> str:
+    out = ["<table>"]
+    if header:
+        out.append("<tr>" + "".join(f"<th>{html.escape(str(h))}</th>" for h in header) + "</tr>")
+    for r in rows:
+        out.append("<tr>" + "".join(f"<td>{_fmt(v)}</td>" for v in r) + "</tr>")
+    out.append("</table>")
+    return "".join(out)
+
+
+def _column_section(p: ColumnProfile, n_rows: int) -> str:
+    pct_missing = p.missing / n_rows * 100 if n_rows else 0.0
+    rows = [("dtype", p.dtype), ("count", p.count), ("missing", f"{p.missing:,} ({pct_missing:.1f}%)")]
+    rows += list(p.stats.items())
+    parts = [f'<div class="col"><div><h3>{html.escape(p.name)}</h3>'
+             f'<div class="note">{p.kind}</div>{_table(rows)}</div>']
+    if p.histogram:
+        parts.append(f"<div>{_svg_histogram(p.histogram)}</div>")
+    if p.top_values:
+        parts.append("<div>" + _table(p.top_values, ("value", "count")) + "</div>")
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def _missingness_section(profiles: List[ColumnProfile], n_rows: int) -> str:
+    rows = []
+    for p in profiles:
+        pct = p.missing / n_rows * 100 if n_rows else 0.0
+        bar = f'<div class="bar" style="width:{pct * 2:.0f}px"></div>'
+        rows.append(f"<tr><td>{html.escape(p.name)}</td><td>{p.missing:,}</td>"
+                    f"<td>{pct:.1f}%</td><td style='text-align:left'>{bar}</td></tr>")
+    return ("<table><tr><th>column</th><th>missing</th><th>%</th><th></th></tr>"
+            + "".join(rows) + "</table>")
+
+
+def _correlation_section(df: pd.DataFrame, top_k: int = 20) -> str:
+    num = df.select_dtypes(include=[np.number])
+    if num.shape[1] < 2:
+        return '<p class="note">Fewer than two numeric columns.</p>'
+    pairs = correlate(num).top_pairs(k=top_k)
+    return _table(list(pairs[["column_a", "column_b", "r"]].itertuples(index=False, name=None)),
+                  ("column A", "column B", "pearson r"))
+
+
+# =============================================================
+# Public entry point
+# =============================================================
+def profile_report(
+    df: pd.DataFrame,
+    title: str = "Fast Profile Report",
+    output_dir: str = "reports",
+    minimal: bool = False,
+    sample: Optional[int] = None,
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> str:
+    """
+    Write a single-file HTML profile of `df` to `output_dir/<title>.html` and return its path.
+
+    sample   -> profile a random sample of this many rows; margins of error are
+                stated in the report header
+    minimal  -> skip correlations and use the sample for duplicate counting too,
+                the cheapest useful report for very large frames
+    workers  -> process pool size for per-column work (None = all cores, 1 = serial)
+    """
+    t0 = time.perf_counter()
+    n_total = len(df)
+    work = sample_rows(df, sample, seed)
+    n_rows = len(work)
+
+    health = column_health(work)
+    profiles = profile_columns(work, workers=workers, unique=health["unique"].to_dict())
+    dups = duplicate_summary(work if minimal else df)
+
+    sections = [f"<h1>{html.escape(title)}</h1>"]
+    header = [("rows", n_total), ("columns", df.shape[1]),
+              ("memory (MB)", float(health["memory_bytes"].sum() / 1024 ** 2) * n_total / max(n_rows, 1)),
+              ("duplicate rows", dups["duplicate_rows"]),
+              ("mode", "minimal" if minimal else "full")]
+    if n_rows < n_total:
+        bounds = error_bounds(n_rows, n_total)
+        header.append(("sampled rows", n_rows))
+        header.append(("± proportions (95%)", f"{bounds['proportion_margin'] * 100:.2f} pp"))
+        header.append(("± means (95%)", f"{bounds['mean_margin_in_std']:.4f} × std"))
+    sections.append("<h2>Overview</h2>" + _table(header))
+
+    flags = [
+        ("empty", health.index[health["empty"]].tolist()),
+        ("constant", health.index[health["constant"]].tolist()),
+        ("high cardinality", health.index[health["high_cardinality"]].tolist()),
+        ("small", health.index[health["small"]].tolist()),
+    ]
+    sections.append("<h2>Alerts</h2>" + _table([(k, ", ".join(map(str, v)) or "-") for k, v in flags]))
+    sections.append("<h2>Variables</h2>" + "".join(_column_section(p, n_rows) for p in profiles))
+    sections.append("<h2>Missing values</h2>" + _missingness_section(profiles, n_rows))
+    if not minimal:
+        sections.append("<h2>Correlations</h2>" + _correlation_section(work))
+
+    elapsed = time.perf_counter() - t0
+    sections.append(f'<p class="note">Generated in {elapsed:.2f}s</p>')
+
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, f"{title}.html")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+                f"<style>{_CSS}</style></head><body>{''.join(sections)}</body></html>")
+    return filename
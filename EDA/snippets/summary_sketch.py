@@ -0,0 +1,435 @@
+# summary_sketch.py — incremental, mergeable profile summaries for appended data
+#
+# Each file (or chunk) is reduced once to a small ProfileSummary that is saved next to
+# the data. Whole-history statistics come from merging summaries, without re-reading
+# old raw files:
+#
+#   summary = summarize_files("data/microwave/MR01D-*.csv", "data/microwave/summaries")
+#   summary.to_frame()
+import base64
+import glob
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SKETCH_VERSION = 1
+QUANTILE_K = 200         # quantile sketch accuracy: rank error ~1.7/k
+HLL_PRECISION = 14       # 2^14 registers (16 KB), ~0.8% distinct-count error
+TOP_K = 20               # heavy hitters tracked per column
+
+
+# =============================================================
+# Moments: count / mean / M2 / min / max
+# =============================================================
+@dataclass
+class RunningMoments:
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def update(self, values: np.ndarray) -> None:
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        c_mean = float(values.mean())
+        other = RunningMoments(len(values), c_mean, float(np.square(values - c_mean).sum()),
+                               float(values.min()), float(values.max()))
+        self.merge(other)
+
+    def merge(self, other: "RunningMoments") -> None:
+        # Chan et al. parallel variance
+        if not other.count:
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2,
+                "min": self.min if self.count else None, "max": self.max if self.count else None}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "RunningMoments":
+        return cls(d["count"], d["mean"], d["m2"],
+                   math.inf if d["min"] is None else d["min"],
+                   -math.inf if d["max"] is None else d["max"])
+
+
+# =============================================================
+# Quantiles: KLL sketch
+# =============================================================
+class QuantileSketch:
+    """
+    KLL quantile sketch (Karnin, Lang, Liberty 2016). Items at level h carry weight 2^h;
+    a full level is sorted and every other item is promoted, so memory stays O(k log n)
+    and two sketches merge by concatenating their levels and compacting.
+    """
+
+    def __init__(self, k: int = QUANTILE_K, seed: int = 0):
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                keep_odd = len(items) % 2
+                leftover, items = items[:keep_odd], items[keep_odd:]
+                promoted = items[int(self._rng.integers(0, 2))::2]
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values: np.ndarray) -> None:
+        values = values[~np.isnan(values)]
+        # feed large chunks in pieces so level 0 never holds more than a few k items
+        step = max(self.k * 8, 1)
+        for start in range(0, len(values), step):
+            self.levels[0] = np.concatenate([self.levels[0], values[start:start + step]])
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self._compress()
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        values = np.concatenate(self.levels)
+        if not len(values):
+            return [float("nan") for _ in qs]
+        weights = np.concatenate([np.full(len(items), 2 ** h, dtype="float64")
+                                  for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cum = values[order], np.cumsum(weights[order])
+        total = cum[-1]
+        return [float(values[min(np.searchsorted(cum, q * total, side="left"), len(values) - 1)]) for q in qs]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "levels": [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(d["k"])
+        sketch.levels = [np.asarray(items, dtype="float64") for items in d["levels"]] or [np.empty(0)]
+        return sketch
+
+
+# =============================================================
+# Distinct count: HyperLogLog
+# =============================================================
+def _leading_zeros64(x: np.ndarray) -> np.ndarray:
+    """Exact count of leading zero bits of uint64 values (64 for zero)."""
+    hi = (x >> np.uint64(32)).astype("float64")
+    lo = (x & np.uint64(0xFFFFFFFF)).astype("float64")
+    with np.errstate(divide="ignore"):
+        lz_hi = 31 - np.floor(np.log2(hi))
+        lz_lo = 63 - np.floor(np.log2(lo))
+    return np.where(hi > 0, lz_hi, np.where(lo > 0, lz_lo, 64)).astype("int64")
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter; merging is an element-wise max of registers."""
+
+    def __init__(self, p: int = HLL_PRECISION):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype="uint8")
+
+    def update_hashes(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        idx = (hashes >> np.uint64(64 - self.p)).astype("int64")
+        rest = hashes << np.uint64(self.p)
+        rank = np.minimum(_leading_zeros64(rest) + 1, 64 - self.p + 1).astype("uint8")
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        m = float(len(self.registers))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.power(2.0, -self.registers.astype("float64"))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)      # linear counting for small cardinalities
+        return raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.p, "registers": base64.b64encode(self.registers.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "HyperLogLog":
+        hll = cls(d["p"])
+        hll.registers = np.frombuffer(base64.b64decode(d["registers"]), dtype="uint8").copy()
+        return hll
+
+
+# =============================================================
+# Top-k: Misra-Gries heavy hitters
+# =============================================================
+class HeavyHitters:
+    """
+    Misra-Gries summary with `k` counters. Reported counts undercount the truth by at
+    most `error` (total discarded weight / (k+1)); any value above n/(k+1) is retained.
+    Mergeable by adding counters and trimming back to k.
+    """
+
+    def __init__(self, k: int = TOP_K):
+        self.k = k
+        self.counts: Dict[str, int] = {}
+        self.error = 0
+
+    def _trim(self) -> None:
+        if len(self.counts) <= self.k:
+            return
+        ranked = sorted(self.counts.values(), reverse=True)
+        cut = ranked[self.k]
+        self.error += cut
+        self.counts = {v: c - cut for v, c in self.counts.items() if c > cut}
+
+    def update_counts(self, counts: Dict[str, int]) -> None:
+        for v, c in counts.items():
+            self.counts[v] = self.counts.get(v, 0) + int(c)
+        self._trim()
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.error += other.error
+        self.update_counts(other.counts)
+
+    def top(self, n: Optional[int] = None) -> List[tuple]:
+        return sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n or self.k]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "counts": self.counts, "error": self.error}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "HeavyHitters":
+        hh = cls(d["k"])
+        hh.counts, hh.error = dict(d["counts"]), d["error"]
+        return hh
+
+
+# =============================================================
+# Column & profile summaries
+# =============================================================
+@dataclass
+class ColumnSummary:
+    kind: str                               # "numeric" | "categorical"
+    rows: int = 0
+    nulls: int = 0
+    moments: Optional[RunningMoments] = None
+    quantiles: Optional[QuantileSketch] = None
+    distinct: HyperLogLog = field(default_factory=HyperLogLog)
+    top: HeavyHitters = field(default_factory=HeavyHitters)
+
+    @classmethod
+    def empty(cls, kind: str) -> "ColumnSummary":
+        if kind == "numeric":
+            return cls(kind, moments=RunningMoments(), quantiles=QuantileSketch())
+        return cls(kind)
+
+    def update(self, s: pd.Series) -> None:
+        self.rows += len(s)
+        non_null = s.dropna()
+        self.nulls += len(s) - len(non_null)
+        if self.kind == "numeric":
+            values = non_null.to_numpy(dtype="float64")
+            self.moments.update(values)
+            self.quantiles.update(values)
+            # hash and key as float64 so 5 in one file and 5.0 in another are one value
+            self.distinct.update_hashes(pd.util.hash_array(values))
+            vc = pd.Series(values).value_counts()
+            key = lambda v: repr(float(v))  # noqa: E731
+        else:
+            self.distinct.update_hashes(pd.util.hash_array(non_null.to_numpy(dtype=object)))
+            vc = non_null.value_counts()
+            key = str
+        # only the chunk's head is stringified; the tail cannot displace the kept counters
+        self.top.update_counts({key(v): int(c) for v, c in vc.head(self.top.k * 4).items()})
+        if len(vc) > self.top.k * 4:
+            # values beyond the chunk's head are below every kept counter; count them as discarded
+            self.top.error += int(vc.iloc[self.top.k * 4])
+
+    def merge(self, other: "ColumnSummary") -> None:
+        if other.kind != self.kind:
+            # a column that was all-numeric in one file and text in another: keep the text view
+            self.kind, self.moments, self.quantiles = "categorical", None, None
+        self.rows += other.rows
+        self.nulls += other.nulls
+        if self.kind == "numeric":
+            self.moments.merge(other.moments)
+            self.quantiles.merge(other.quantiles)
+        self.distinct.merge(other.distinct)
+        self.top.merge(other.top)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {"kind": self.kind, "rows": self.rows, "nulls": self.nulls,
+             "distinct": self.distinct.to_dict(), "top": self.top.to_dict()}
+        if self.kind == "numeric":
+            d["moments"] = self.moments.to_dict()
+            d["quantiles"] = self.quantiles.to_dict()
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ColumnSummary":
+        col = cls(d["kind"], d["rows"], d["nulls"],
+                  distinct=HyperLogLog.from_dict(d["distinct"]),
+                  top=HeavyHitters.from_dict(d["top"]))
+        if col.kind == "numeric":
+            col.moments = RunningMoments.from_dict(d["moments"])
+            col.quantiles = QuantileSketch.from_dict(d["quantiles"])
+        return col
+
+
+@dataclass
+class ProfileSummary:
+    rows: int = 0
+    columns: Dict[str, ColumnSummary] = field(default_factory=dict)
+    sources: List[str] = field(default_factory=list)
+
+    def update(self, df: pd.DataFrame) -> None:
+        self.rows += len(df)
+        for col in df.columns:
+            s = df[col]
+            name = str(col)
+            if name not in self.columns:
+                kind = "numeric" if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s) else "categorical"
+                self.columns[name] = ColumnSummary.empty(kind)
+                # rows seen before this column first appeared count as missing
+                self.columns[name].rows = self.columns[name].nulls = self.rows - len(df)
+            summary = self.columns[name]
+            if summary.kind == "numeric" and not pd.api.types.is_numeric_dtype(s):
+                summary.merge(ColumnSummary.empty("categorical"))
+            summary.update(s)
+        for name, summary in self.columns.items():
+            if name not in df.columns.astype(str):
+                summary.rows += len(df)
+                summary.nulls += len(df)
+
+    def merge(self, other: "ProfileSummary") -> "ProfileSummary":
+        """Merge `other` into this summary in place and return self."""
+        for name in set(self.columns) - set(other.columns):
+            self.columns[name].rows += other.rows
+            self.columns[name].nulls += other.rows
+        for name, col in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(col)
+            else:
+                copy = ColumnSummary.from_dict(col.to_dict())
+                copy.rows += self.rows
+                copy.nulls += self.rows
+                self.columns[name] = copy
+        self.rows += other.rows
+        self.sources += other.sources
+        return self
+
+    # ---------- constructors ----------
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, source: str = "") -> "ProfileSummary":
+        summary = cls(sources=[source] if source else [])
+        summary.update(df)
+        return summary
+
+    @classmethod
+    def from_csv(cls, path: str, chunksize: int = 500_000, **read_kwargs) -> "ProfileSummary":
+        summary = cls(sources=[path])
+        for chunk in pd.read_csv(path, chunksize=chunksize, **read_kwargs):
+            summary.update(chunk)
+        return summary
+
+    # ---------- persistence ----------
+    def save(self, path: str) -> None:
+        data = {"version": SKETCH_VERSION, "rows": self.rows, "sources": self.sources,
+                "columns": {name: col.to_dict() for name, col in self.columns.items()}}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> "ProfileSummary":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != SKETCH_VERSION:
+            raise ValueError(f"{path}: unsupported summary version {data.get('version')}")
+        return cls(rows=data["rows"], sources=list(data["sources"]),
+                   columns={n: ColumnSummary.from_dict(c) for n, c in data["columns"].items()})
+
+    # ---------- reporting ----------
+    def to_frame(self) -> pd.DataFrame:
+        """describe()-style table; quantiles and distinct counts are sketch estimates."""
+        rows = {}
+        for name, col in self.columns.items():
+            r: Dict[str, Any] = {"kind": col.kind, "count": col.rows - col.nulls, "nulls": col.nulls,
+                                 "distinct~": round(col.distinct.estimate())}
+            if col.kind == "numeric" and col.moments.count:
+                q = col.quantiles.quantiles([0.25, 0.5, 0.75])
+                r.update({"mean": col.moments.mean, "std": math.sqrt(col.moments.variance)
+                          if col.moments.count > 1 else float("nan"),
+                          "min": col.moments.min, "25%~": q[0], "50%~": q[1], "75%~": q[2],
+                          "max": col.moments.max})
+            top = col.top.top(1)
+            if top:
+                r["top"], r["freq≥"] = top[0]
+            rows[name] = r
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def merge_summaries(summaries: Iterable[ProfileSummary]) -> ProfileSummary:
+    total = ProfileSummary()
+    for s in summaries:
+        total.merge(s)
+    return total
+
+
+def summarize_files(
+    source: str,
+    summary_dir: str,
+    chunksize: int = 500_000,
+    **read_kwargs,
+) -> ProfileSummary:
+    """
+    Merge per-file summaries for every CSV matched by `source` (directory or glob).
+
+    A file is only read when its summary in `summary_dir` is missing or older than
+    the file, so adding one day's export costs one file scan plus a merge.
+    """
+    pattern = os.path.join(source, "*.csv") if os.path.isdir(source) else source
+    os.makedirs(summary_dir, exist_ok=True)
+    parts: List[ProfileSummary] = []
+    for path in sorted(glob.glob(pattern)):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        cached = os.path.join(summary_dir, f"{stem}.summary.json")
+        if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+            parts.append(ProfileSummary.load(cached))
+            continue
+        part = ProfileSummary.from_csv(path, chunksize=chunksize, **read_kwargs)
+        part.save(cached)
+        parts.append(part)
+    return merge_summaries(parts)
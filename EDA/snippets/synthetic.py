@@ -0,0 +1,136 @@
+# synthetic.py — scalable synthetic datasets shaped like the bundled EDA samples
+import os
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+# name -> sample file the synthetic data copies its schema and distributions from
+SAMPLES: Dict[str, str] = {
+    "wine-red": "winequality-red.csv",
+    "wine-white": "winequality-white.csv",
+    "flower": "flower_dataset.csv",
+    "titanic": "Titanic-Dataset.csv",
+}
+
+DATASETS: List[str] = [*SAMPLES, "microwave"]
+
+MICROWAVE_BASE_ROWS = 10_000     # 1x size of the synthetic wide tool log
+MICROWAVE_SENSORS = 300
+MICROWAVE_CHUNK_ROWS = 50_000    # ~120 MB per generated chunk
+
+
+def synthesize(sample: pd.DataFrame, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Draw `n_rows` rows that follow `sample` column by column.
+
+    Numeric columns are bootstrapped from the observed values with a small jitter
+    clipped to the sample's range (whole-number columns stay whole), text columns are drawn with the observed
+    frequencies, and each column keeps its missing-value rate. Columns are drawn
+    independently, so marginal distributions match but cross-column correlation
+    does not.
+    """
+    rng = np.random.default_rng(seed)
+    out: Dict[str, np.ndarray] = {}
+    for col in sample.columns:
+        s = sample[col]
+        observed = s.dropna()
+        if not len(observed):
+            out[col] = np.full(n_rows, np.nan)
+            continue
+        values = rng.choice(observed.to_numpy(), size=n_rows, replace=True)
+        if pd.api.types.is_float_dtype(s):
+            spread = float(observed.std() or 0.0) * 0.01
+            values = values + rng.normal(0.0, spread, size=n_rows)
+            # stay inside the observed range (no negative prices or concentrations)
+            values = np.clip(values, observed.min(), observed.max())
+        series = pd.Series(values)
+        null_rate = 1 - len(observed) / len(s)
+        if null_rate:
+            series[rng.random(n_rows) < null_rate] = np.nan
+        out[col] = series.to_numpy()
+    return pd.DataFrame(out)
+
+
+def load_sample(name: str) -> pd.DataFrame:
+    return pd.read_csv(os.path.join(DATA_DIR, SAMPLES[name]))
+
+
+def microwave_chunks(
+    n_rows: int,
+    n_sensors: int = MICROWAVE_SENSORS,
+    seed: int = 0,
+    chunk_rows: int = MICROWAVE_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Wide tool-log shape like the MR01D-*.csv exports, `chunk_rows` rows at a time:
+    constant tool metadata columns, a timestamp, a runtime column with the raw
+    'TDS: Sig: Runtime' label, hundreds of float sensors (some empty, some constant)
+    and ~1% repeated rows (repeats stay within a chunk).
+    """
+    levels = np.random.default_rng(seed).uniform(0, 500, n_sensors)
+    for k, start in enumerate(range(0, n_rows, chunk_rows)):
+        n = min(chunk_rows, n_rows - start)
+        rng = np.random.default_rng([seed, k])
+        data: Dict[str, object] = {
+            "Tool ID": np.full(n, "MR01D"),
+            "Tool Description": np.full(n, "Microwave Reactor"),
+            "Tool Area": np.full(n, "Etch"),
+            "Timestamp": (pd.Timestamp("2022-10-31") + pd.to_timedelta(np.arange(start, start + n), unit="s")).astype(str),
+            "TDS: Sig: Runtime": np.arange(start, start + n, dtype="float64"),
+        }
+        for i in range(n_sensors):
+            name = f"Sensor {i:03d}"
+            if i % 50 == 7:
+                data[name] = np.full(n, np.nan)
+            elif i % 50 == 13:
+                data[name] = np.full(n, round(levels[i], 2))
+            else:
+                data[name] = np.round(levels[i] + rng.normal(0, levels[i] * 0.05 + 1, n), 3)
+        df = pd.DataFrame(data, index=pd.RangeIndex(start, start + n))
+        n_dup = n // 100
+        if n_dup:
+            src = rng.integers(0, n, n_dup)
+            dst = rng.integers(0, n, n_dup)
+            df.iloc[dst] = df.iloc[src].to_numpy()
+        yield df
+
+
+def microwave_log(n_rows: int, n_sensors: int = MICROWAVE_SENSORS, seed: int = 0) -> pd.DataFrame:
+    """The whole microwave_chunks() log as one frame (for sizes that fit in memory)."""
+    return pd.concat(microwave_chunks(n_rows, n_sensors, seed), ignore_index=True)
+
+
+def make_dataset(name: str, scale: int = 1, seed: int = 0) -> pd.DataFrame:
+    """
+    Dataset `name` at `scale` times its sample size (e.g. wine-red x1000 ~ 1.6M rows).
+    Names: wine-red, wine-white, flower, titanic, microwave.
+    """
+    if name == "microwave":
+        return microwave_log(MICROWAVE_BASE_ROWS * scale, seed=seed)
+    if name not in SAMPLES:
+        raise ValueError(f"Unknown dataset '{name}'. Choose from {DATASETS}.")
+    sample = load_sample(name)
+    return synthesize(sample, len(sample) * scale, seed=seed)
+
+
+def cached_csv(name: str, scale: int, cache_dir: str, seed: int = 0) -> str:
+    """
+    Write make_dataset(name, scale) to `cache_dir` once and return the CSV path.
+    The microwave log is generated and appended chunk by chunk, so even x1000
+    (10M rows x 305 columns) never has to fit in memory.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{name}_x{scale}_s{seed}.csv")
+    if not os.path.exists(path):
+        tmp = path + ".tmp"
+        if name == "microwave":
+            with open(tmp, "w", encoding="utf-8", newline="") as f:
+                for i, chunk in enumerate(microwave_chunks(MICROWAVE_BASE_ROWS * scale, seed=seed)):
+                    chunk.to_csv(f, index=False, header=i == 0)
+        else:
+            make_dataset(name, scale, seed).to_csv(tmp, index=False)
+        os.replace(tmp, path)
+    return path
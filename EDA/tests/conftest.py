@@ -0,0 +1,5 @@
+# lets `pytest` run from EDA/ or the repo root and import snippets the way the notebooks do
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from snippets.benchmark import compare
+from snippets.synthetic import load_sample, make_dataset
+
+
+def test_compare_keeps_error_rows_when_every_case_failed():
+    results = pd.DataFrame([{"dataset": "wine-red", "scale": 1, "op": "duckdb_health",
+                             "error": "ModuleNotFoundError: No module named 'duckdb'"}])
+    table = compare(results, {})
+    assert table["status"].tolist() == ["error"]
+    assert "ratio" not in table.columns
+
+
+def test_synthetic_numeric_columns_stay_in_sample_range():
+    for name in ("wine-red", "titanic"):
+        sample = load_sample(name)
+        data = make_dataset(name, 2)
+        num = sample.select_dtypes("number").columns
+        assert data[num].ge(sample[num].min()).where(data[num].notna(), True).all().all()
+        assert data[num].le(sample[num].max()).where(data[num].notna(), True).all().all()
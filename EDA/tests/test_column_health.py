@@ -0,0 +1,32 @@
+import pandas as pd
+
+from snippets.column_health import column_health
+
+
+def test_blank_counts_agree_for_low_and_high_cardinality():
+    values = ["x", " ", "", None, 3, "\t", "y"]
+    low = values * 100                                              # 6 distinct values
+    high = [v if i % 7 else f"id{i}" for i, v in enumerate(low)]    # mostly distinct
+    df = pd.DataFrame({"low": low, "high": high})
+
+    report = column_health(df)
+    assert report.loc["low", "blanks"] == 300
+    assert report.loc["high", "blanks"] == 300
+
+
+def test_blank_counts_ignore_object_columns_without_strings():
+    import datetime
+    from decimal import Decimal
+
+    n = 200
+    df = pd.DataFrame({
+        "ints": pd.Series(range(n), dtype=object),
+        "dates": [datetime.date(2022, 1, 1) + datetime.timedelta(days=i) for i in range(n)],
+        "decimals": [Decimal(i) / 7 for i in range(n)],
+        "flags": pd.Series([True, False, None], dtype=object),
+        "mixed": [f"id{i}" if i % 3 else (i if i % 2 else " ") for i in range(n)],
+    })
+
+    report = column_health(df)
+    assert report.loc[["ints", "dates", "decimals", "flags"], "blanks"].eq(0).all()
+    assert report.loc["mixed", "blanks"] == sum(1 for i in range(n) if i % 3 == 0 and i % 2 == 0)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from snippets.correlation import StreamingCorrelation, correlate_csv, correlate_files
+
+
+def _frame(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, 5)), columns=list("abcde"))
+    df["b"] = df["a"] * 0.8 + rng.normal(size=n) * 0.3
+    df["c"] = np.exp(df["b"]) + 100            # monotone in b: Spearman 1, Pearson below 1
+    df.loc[rng.random(n) < 0.1, "d"] = np.nan  # pairwise-complete handling
+    return df
+
+
+def test_chunked_blocked_pearson_matches_pandas():
+    df = _frame()
+    acc = StreamingCorrelation(list(df.columns), block_size=2)
+    for start in range(0, len(df), 37):
+        acc.update(df.iloc[start:start + 37])
+    np.testing.assert_allclose(acc.matrix().to_numpy(), df.corr().to_numpy(), atol=1e-10)
+
+
+def test_merged_parts_match_the_whole(tmp_path):
+    df = _frame()
+    paths = []
+    for i, part in enumerate([df.iloc[:150], df.iloc[150:260], df.iloc[260:]]):
+        paths.append(str(tmp_path / f"part{i}.csv"))
+        part.to_csv(paths[-1], index=False)
+    merged = correlate_files(paths, block_size=2, chunk_rows=50)
+    np.testing.assert_allclose(merged.matrix().to_numpy(), df.corr().to_numpy(), atol=1e-10)
+
+
+def test_spearman_from_csv_ignores_quoted_newlines_and_blank_lines(tmp_path):
+    # no missing values: with gaps, pandas re-ranks each pair on its shared rows
+    df = _frame().fillna(0.0)
+    path = tmp_path / "log.csv"
+    df.assign(note=["two\nlines" if i % 3 else "ok" for i in range(len(df))]).to_csv(path, index=False)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n\n")
+
+    cols = list("abcde")
+    got = correlate_csv(str(path), method="spearman", columns=cols, block_size=2, chunk_rows=64).matrix()
+    np.testing.assert_allclose(got.to_numpy(), df.corr(method="spearman").to_numpy(), atol=1e-6)
+
+    head = correlate_csv(str(path), method="spearman", columns=cols, nrows=100).matrix()
+    np.testing.assert_allclose(head.to_numpy(), df.head(100).corr(method="spearman").to_numpy(), atol=1e-6)
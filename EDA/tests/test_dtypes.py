@@ -0,0 +1,45 @@
+import pandas as pd
+
+from snippets.dtypes import infer_schema, load_schema, read_csv_compact
+
+
+def _append(path, lines):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def test_saved_schema_rejects_out_of_range_values(tmp_path):
+    path = tmp_path / "log.csv"
+    pd.DataFrame({"q": [1, 2, 3], "f": [0.5, 1.25, 2.0]}).to_csv(path, index=False)
+    assert read_csv_compact(str(path), verbose=False)["q"].dtype == "uint8"
+
+    _append(path, ["300,1.0"])
+    df = read_csv_compact(str(path), verbose=False)
+    assert df["q"].tolist()[-1] == 300
+    assert load_schema(str(tmp_path / "log.schema.json"))["q"] == "uint16"
+
+    _append(path, ["-2,1.0"])
+    assert read_csv_compact(str(path), verbose=False)["q"].tolist()[-1] == -2
+
+    _append(path, [",1.0"])
+    assert read_csv_compact(str(path), verbose=False)["q"].isna().sum() == 1
+
+
+def test_saved_float32_schema_rejects_extra_precision(tmp_path):
+    path = tmp_path / "log.csv"
+    pd.DataFrame({"lat": [47.25, 1.5]}).to_csv(path, index=False)
+    assert read_csv_compact(str(path), verbose=False)["lat"].dtype == "float32"
+
+    _append(path, ["47.1234567"])
+    df = read_csv_compact(str(path), verbose=False)
+    assert df["lat"].dtype == "float64"
+    assert df["lat"].tolist()[-1] == 47.1234567
+
+
+def test_float32_only_when_decimals_survive():
+    schema = infer_schema(pd.DataFrame({
+        "id": [123456789.5, 2.5],
+        "lat": [47.1234567, 1.0],
+        "price": [0.1, 3.25],
+    }))
+    assert schema == {"id": "float64", "lat": "float64", "price": "float32"}
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from snippets.summary_sketch import (
+    HeavyHitters, HyperLogLog, ProfileSummary, QuantileSketch, RunningMoments, merge_summaries,
+)
+
+
+def test_kll_rank_error_after_merging_parts():
+    rng = np.random.default_rng(0)
+    data = rng.lognormal(size=200_000)
+    sketch = QuantileSketch(k=200)
+    for part in np.array_split(data, 4):
+        piece = QuantileSketch(k=200, seed=len(part))
+        piece.update(part)
+        sketch.merge(piece)
+
+    truth = np.sort(data)
+    qs = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+    ranks = np.searchsorted(truth, sketch.quantiles(qs)) / len(truth)
+    assert np.max(np.abs(ranks - qs)) < 0.02           # documented ~1.7/k = 0.0085
+    assert sum(len(level) for level in sketch.levels) < 2_000
+
+
+def test_hll_estimate_and_union_merge():
+    a = pd.util.hash_array(np.arange(0, 60_000))
+    b = pd.util.hash_array(np.arange(40_000, 100_000))
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update_hashes(a)
+    right.update_hashes(b)
+    assert abs(left.estimate() / 60_000 - 1) < 0.04
+    left.merge(right)
+    assert abs(left.estimate() / 100_000 - 1) < 0.04     # overlap is not double counted
+
+    small = HyperLogLog()
+    small.update_hashes(pd.util.hash_array(np.arange(50)))
+    assert round(small.estimate()) == 50
+
+
+def test_misra_gries_bounds_hold_across_merges():
+    rng = np.random.default_rng(1)
+    values = rng.zipf(1.5, size=50_000) % 500
+    truth = pd.Series(values).value_counts()
+    total = HeavyHitters(k=20)
+    for part in np.array_split(values, 5):
+        hh = HeavyHitters(k=20)
+        hh.update_counts({str(v): int(c) for v, c in pd.Series(part).value_counts().items()})
+        total.merge(hh)
+
+    assert total.error <= len(values) / (total.k + 1)
+    for v, c in truth.items():
+        reported = total.counts.get(str(v), 0)
+        assert reported <= c <= reported + total.error
+        if c > len(values) / (total.k + 1):
+            assert str(v) in total.counts
+
+
+def test_merged_file_summaries_match_the_whole(tmp_path):
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"x": rng.normal(10, 2, 3_000), "label": rng.choice(list("abc"), 3_000)})
+    df.loc[::7, "x"] = np.nan
+    parts = [ProfileSummary.from_frame(part) for part in (df.iloc[:1_000], df.iloc[1_000:])]
+    parts[1].save(str(tmp_path / "part.json"))
+    merged = merge_summaries([parts[0], ProfileSummary.load(str(tmp_path / "part.json"))])
+
+    x = merged.columns["x"]
+    assert (merged.rows, x.nulls) == (3_000, int(df["x"].isna().sum()))
+    np.testing.assert_allclose([x.moments.mean, x.moments.variance], [df["x"].mean(), df["x"].var()])
+    assert merged.columns["label"].top.top(1)[0] == (df["label"].mode()[0], df["label"].value_counts().iloc[0])
+
+    whole = RunningMoments()
+    whole.update(df["x"].to_numpy())
+    assert whole.count == x.moments.count
@@ -1,9 +1,19 @@
 # LLMClient.py
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, field
+import json
+from typing import Optional, Dict, Any, Iterator
 
 import requests
 
+from prompt_cache import PromptCache, CacheHit
+from scheduler import RequestScheduler
+from structured_output import (
+    JsonStreamValidator,
+    local_http_constraints,
+    openai_response_format,
+    schema_fingerprint,
+)
+
 try:
     from openai import OpenAI
 except Exception:
@@ -19,6 +29,14 @@ class LLMClient:
       - "openai"     -> uses OpenAI Chat Completions API
       - "local_http" -> calls an OpenAI-compatible /v1/chat/completions endpoint
                         (e.g., llama_cpp.server, vLLM, etc.)
+
+    With `output_schema` set the call runs in structured-output mode: the schema is
+    enforced by the provider (OpenAI response_format, llama_cpp grammar), the reply
+    is streamed through a JsonStreamValidator and generation stops once a JSON value
+    closes, parses and matches the schema. The returned text is that JSON only.
+
+    With a `scheduler` attached, provider calls queue there under `priority`
+    ("interactive", "batch" or "background"); cache hits never queue.
     """
 
     provider: str = "openai"
@@ -31,14 +49,62 @@ class LLMClient:
     base_url: Optional[str] = None     # e.g. "http://localhost:8001/v1/chat/completions"
     extra_headers: Optional[Dict[str, str]] = None
 
-    def run_prompt(self, prompt: str) -> str:
+    # opt-in near-duplicate response cache (see prompt_cache.py)
+    cache: Optional[PromptCache] = None
+    cache_threshold: Optional[float] = None   # per-caller similarity threshold (None = the cache's own)
+    last_cache_hit: Optional[CacheHit] = field(default=None, repr=False)
+
+    # structured output (see structured_output.py)
+    output_schema: Optional[Dict[str, Any]] = None
+    grammar: Optional[str] = None      # raw GBNF for llama_cpp; overrides the schema-derived grammar
+
+    # shared request scheduler for the backend (see scheduler.py)
+    scheduler: Optional[RequestScheduler] = None
+    priority: str = "interactive"
+
+    def run_prompt(self, prompt: str, use_cache: bool = True) -> str:
+        """
+        Run `prompt` on the configured provider. When a cache is attached and
+        `use_cache` is set, a sufficiently similar earlier prompt for the same
+        provider/model is answered from the cache and `last_cache_hit` records where
+        the response came from; otherwise `last_cache_hit` is None.
+        """
+        self.last_cache_hit = None
+        # structured and free-text answers to the same prompt must not be mixed up
+        cache_model = self.model
+        if self.output_schema is not None:
+            cache_model = f"{self.model}#schema:{schema_fingerprint(self.output_schema)}"
+        if self.cache is not None and use_cache:
+            hit = self.cache.lookup(self.provider, cache_model, prompt, self.cache_threshold)
+            if hit is not None:
+                self.last_cache_hit = hit
+                return hit.response
+
         if self.provider == "openai":
-            return self._run_openai(prompt)
+            call = self._run_openai_structured if self.output_schema is not None else self._run_openai
         elif self.provider == "local_http":
-            return self._run_local_http(prompt)
+            call = self._run_local_http_structured if self.output_schema is not None else self._run_local_http
         else:
             raise NotImplementedError(f"Provider '{self.provider}' not supported.")
 
+        if self.scheduler is not None:
+            response = self.scheduler.run(lambda: call(prompt), self.priority)
+        else:
+            response = call(prompt)
+
+        if self.cache is not None:
+            self.cache.store(self.provider, cache_model, prompt, response)
+        return response
+
+    def _collect_structured(self, deltas: Iterator[str]) -> str:
+        """Feed streamed text into the validator; stop reading once the JSON is complete."""
+        validator = JsonStreamValidator(self.output_schema)
+        for delta in deltas:
+            if validator.feed(delta):
+                break
+        validator.result()
+        return validator.text
+
     # ---------- OpenAI ----------
     def _run_openai(self, prompt: str) -> str:
         if OpenAI is None:
@@ -56,6 +122,32 @@ class LLMClient:
         content = resp.choices[0].message.content
         return content.strip() if content else ""
 
+    def _run_openai_structured(self, prompt: str) -> str:
+        if OpenAI is None:
+            raise RuntimeError("openai package not installed. Run `pip install openai`.")
+        if not self.api_key:
+            raise ValueError("Missing OpenAI API key.")
+
+        client = OpenAI(api_key=self.api_key)
+        stream = client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.temperature,
+            max_tokens=self.max_output_tokens,
+            response_format=openai_response_format(self.output_schema),
+            stream=True,
+        )
+
+        def deltas() -> Iterator[str]:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        try:
+            return self._collect_structured(deltas())
+        finally:
+            stream.close()      # drops the connection, so the server stops generating
+
     # ---------- Local HTTP (Llama3, Gemma, etc.) ----------
     def _run_local_http(self, prompt: str) -> str:
         """
@@ -90,3 +182,40 @@ class LLMClient:
         # Assume OpenAI-style response
         content = data["choices"][0]["message"]["content"]
         return content.strip() if content else ""
+
+    def _run_local_http_structured(self, prompt: str) -> str:
+        """Same endpoint with a JSON-schema/GBNF constraint, read as a server-sent event stream."""
+        if not self.base_url:
+            raise ValueError("base_url must be set for provider='local_http'.")
+
+        headers: Dict[str, str] = {
+            "Content-Type": "application/json",
+        }
+        if self.extra_headers:
+            headers.update(self.extra_headers)
+
+        payload: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.temperature,
+            "max_tokens": self.max_output_tokens,
+            "stream": True,
+        }
+        payload.update(local_http_constraints(self.output_schema, self.grammar))
+
+        def deltas(resp) -> Iterator[str]:
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+
+        # closing the response mid-stream makes llama_cpp.server abort the generation
+        with requests.post(self.base_url, json=payload, headers=headers, timeout=120, stream=True) as resp:
+            resp.raise_for_status()
+            return self._collect_structured(deltas(resp))
@@ -7,8 +7,10 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import streamlit as st
 
-from templates import FRAMEWORKS  # registry + specs + assemblers
+from templates import FRAMEWORKS, resolve_output_schema  # registry + specs + assemblers
 from LLMClient import LLMClient
+from prompt_cache import PromptCache, DEFAULT_THRESHOLD
+from scheduler import PRIORITIES, RequestScheduler
 
 # =============================================================
 # LLM provider registry and simple .env loader
@@ -16,6 +18,7 @@ from LLMClient import LLMClient
 # LLM_PROVIDERS = ["OpenAI", "Anthropic", "Llama", "Gemma"]  # adjust to your actual providers
 LLM_PROVIDERS = ["OpenAI", "Llama"]  # adjust to your actual providers
 LOCAL_LLMS = ["Llama", "Gemma"]      # those that run locally, no API key needed
+PROVIDER_CONCURRENCY = {"OpenAI": 4, "Llama": 1, "Gemma": 1}   # simultaneous calls per backend
 
 
 def load_env_keys(env_path: str = ".env") -> Dict[str, str]:
@@ -62,6 +65,16 @@ def save_templates(data: Dict[str, Dict[str, Any]]) -> None:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+# responses to near-duplicate prompts, persisted next to the templates
+PROMPT_CACHE_FILE = "prompt_cache.json"
+
+
+@st.cache_resource
+def shared_prompt_cache() -> PromptCache:
+    """One prompt cache (and cache file) shared by every session of this app process."""
+    return PromptCache(path=PROMPT_CACHE_FILE)
+
+
 # =============================================================
 # Session state init
 # =============================================================
@@ -83,6 +96,11 @@ def ensure_state():
     ss.setdefault("llm_responses", {})               # { provider_name: response_str }
     ss.setdefault("llm_selected_view", None)         # which provider to view on Response page
     ss.setdefault("llm_sidebar_selected", [])        # list of providers to send to on Send action
+    ss.setdefault("llm_cache_hits", {})              # { provider_name: CacheHit } for cached responses
+
+    # near-duplicate prompt cache (opt-in from the sidebar)
+    ss.setdefault("cache_enabled", False)
+    ss.setdefault("cache_threshold", DEFAULT_THRESHOLD)
 
     # per-LLM configuration: api_key (optional), enabled flag, and type ('api' | 'local')
     default_configs = {}
@@ -296,6 +314,16 @@ def render_field(field, values: Dict[str, Any]):
             on_change=lambda: on_widget_change(key),
             height=100,
         )
+    elif field.widget == "schema":
+        st.text_area(
+            label,
+            value=values.get(key, ""),
+            key=f"inp_{key}",
+            placeholder=placeholder or '{"type": "object", "properties": {...}, "required": [...]}',
+            help=help_txt,
+            on_change=lambda: on_widget_change(key),
+            height=140,
+        )
     else:
         st.text_input(
             label,
@@ -541,10 +569,52 @@ def render_sidebar():
             if st.button("Config", key=f"cfg_{p}", on_click=lambda prov=p: request_llm_config(prov)):
                 pass
 
+        st.markdown("### Prompt Cache")
+        cache = shared_prompt_cache()
+        # plain session keys (not widget keys) so the settings survive while the sidebar is hidden
+        st.session_state["cache_enabled"] = st.toggle(
+            "Reuse responses to similar prompts",
+            value=st.session_state["cache_enabled"],
+            help="Answer prompts that differ only slightly from an earlier one (same model) from the cache.",
+        )
+        st.session_state["cache_threshold"] = st.slider(
+            "Similarity threshold",
+            min_value=0.5,
+            max_value=1.0,
+            value=float(st.session_state["cache_threshold"]),
+            step=0.01,
+            disabled=not st.session_state["cache_enabled"],
+        )
+        stats = cache.stats()
+        st.caption(f"{stats['entries']} cached · {stats['hits']} hits / {stats['lookups']} lookups")
+        if st.button("Clear Cache", key="cache_clear"):
+            cache.clear()
+            st.session_state["llm_cache_hits"] = {}
+            st.rerun()
+
+        st.markdown("### Request Queue")
+        st.caption("Clicks here run as interactive and go ahead of queued batch/background work.")
+        for p in LLM_PROVIDERS:
+            if not st.session_state["llm_configs"].get(p, {}).get("enabled"):
+                continue
+            metrics = shared_scheduler(p).metrics()
+            st.markdown(f"**{p}**")
+            st.table([
+                {"class": c, "queued": m["queued"], "running": m["running"],
+                 "avg wait s": m["avg_wait_s"], "p95 wait s": m["p95_wait_s"]}
+                for c, m in ((c, metrics[c]) for c in PRIORITIES if c in metrics)
+            ])
+
 
 # =============================================================
 # Multi-LLM send logic
 # =============================================================
+@st.cache_resource
+def shared_scheduler(provider_name: str) -> RequestScheduler:
+    """One scheduler per backend, shared by every session of this app process."""
+    return RequestScheduler(max_concurrency=PROVIDER_CONCURRENCY.get(provider_name, 1))
+
+
 def build_client_for_provider(provider_name: str) -> tuple[str, LLMClient]:
     """
     Map UI provider name -> (label, LLMClient instance).
@@ -564,6 +634,7 @@ def build_client_for_provider(provider_name: str) -> tuple[str, LLMClient]:
                 temperature=0.7,
                 max_output_tokens=1024,
             )
+            client.scheduler = shared_scheduler(provider_name)
             label = "OpenAI (gpt-4o-mini)"
             return label, client
         # future: other API providers (Claude, etc.)
@@ -578,6 +649,7 @@ def build_client_for_provider(provider_name: str) -> tuple[str, LLMClient]:
             temperature=0.7,
             max_output_tokens=1024,
         )
+        client.scheduler = shared_scheduler(provider_name)
         label = "Llama (local-llama3)"
         return label, client
 
@@ -585,19 +657,36 @@ def build_client_for_provider(provider_name: str) -> tuple[str, LLMClient]:
     raise NotImplementedError(f"Local provider mapping not implemented for {provider_name}.")
 
 
-def send_prompt_to_selected_llms():
+def current_output_schema():
+    """JSON Schema for structured-output mode for the current editor values, or None."""
+    spec = current_spec()
+    return resolve_output_schema(spec, st.session_state["values"]) if spec else None
+
+
+def send_prompt_to_selected_llms(use_cache: bool = True, only: List[str] = None):
+    """
+    Run the current prompt on every enabled provider (or just `only`).
+    With the sidebar cache on, near-duplicate prompts are answered from the cache
+    unless `use_cache` is False; cache provenance is kept in llm_cache_hits.
+    """
     prompt = assemble_preview()
+    try:
+        output_schema = current_output_schema()
+    except ValueError as e:
+        st.error(str(e))
+        return
 
     llm_configs = st.session_state["llm_configs"]
 
     # Use all providers that are "enabled" in their Config dialog
-    targets = [p for p, cfg in llm_configs.items() if cfg.get("enabled")]
+    targets = [p for p, cfg in llm_configs.items() if cfg.get("enabled") and (only is None or p in only)]
 
     if not targets:
         st.error("No LLMs are enabled. Open a provider's Config and check 'Enable for use'.")
         return
 
     results = st.session_state.get("llm_responses", {})
+    cache_hits = st.session_state.get("llm_cache_hits", {})
     clients = []
     skipped = {}
 
@@ -605,6 +694,10 @@ def send_prompt_to_selected_llms():
         cfg = llm_configs.get(p, {})
         try:
             label, client = build_client_for_provider(p)
+            if st.session_state.get("cache_enabled"):
+                client.cache = shared_prompt_cache()
+                client.cache_threshold = st.session_state["cache_threshold"]
+            client.output_schema = output_schema
             clients.append((p, label, client))
         except NotImplementedError as e:
             skipped[p] = f"[Skipped: {e}]"
@@ -621,22 +714,27 @@ def send_prompt_to_selected_llms():
         with st.spinner("Running prompt across selected models..."):
             with ThreadPoolExecutor(max_workers=len(clients)) as pool:
                 fut_map = {
-                    pool.submit(client.run_prompt, prompt): (provider, label)
+                    pool.submit(client.run_prompt, prompt, use_cache): (provider, label, client)
                     for (provider, label, client) in clients
                 }
                 for fut in as_completed(fut_map):
-                    provider, label = fut_map[fut]
+                    provider, label, client = fut_map[fut]
                     try:
                         resp_text = fut.result()
                     except Exception as e:
                         resp_text = f"[Error calling {label}: {e}]"
                     results[provider] = resp_text
+                    cache_hits.pop(provider, None)
+                    if client.last_cache_hit is not None:
+                        cache_hits[provider] = client.last_cache_hit
 
     # Attach skipped messages
     for p, msg in skipped.items():
         results[p] = msg
+        cache_hits.pop(p, None)
 
     st.session_state["llm_responses"] = results
+    st.session_state["llm_cache_hits"] = cache_hits
     st.success("Requests complete.")
     st.rerun()
 
@@ -675,6 +773,11 @@ def responses_mode():
     # Prompt preview + global actions
     st.markdown("#### Final Prompt Preview")
     st.code(assemble_preview(), language="markdown")
+    try:
+        if current_output_schema() is not None:
+            st.caption("Structured output: replies are constrained to the template's JSON Schema and validated.")
+    except ValueError as e:
+        st.warning(str(e))
 
     c1, c2 = st.columns([1, 1])
     with c1:
@@ -683,6 +786,7 @@ def responses_mode():
     with c2:
         if st.button("Clear Responses"):
             st.session_state["llm_responses"] = {}
+            st.session_state["llm_cache_hits"] = {}
             st.success("Cleared.")
 
     # Tabs for enabled providers only
@@ -690,12 +794,20 @@ def responses_mode():
     tabs = st.tabs(providers)
 
     llm_responses = st.session_state.get("llm_responses", {})
+    cache_hits = st.session_state.get("llm_cache_hits", {})
 
     for provider, tab in zip(providers, tabs):
         with tab:
             resp = llm_responses.get(provider, "")
             if not resp:
                 st.caption("No response yet for this model. Click 'Send to LLM' above to run the prompt.")
+            hit = cache_hits.get(provider)
+            if hit is not None:
+                st.info(hit.describe(), icon="♻️")
+                with st.expander("Cached prompt"):
+                    st.code(hit.cached_prompt, language="markdown")
+                if st.button("Re-run without cache", key=f"rerun_fresh_{provider}"):
+                    send_prompt_to_selected_llms(use_cache=False, only=[provider])
             st.text_area(
                 f"{provider} Response",
                 value=resp,
@@ -0,0 +1,251 @@
+# prompt_cache.py — near-duplicate prompt cache (MinHash LSH) for LLMClient
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Set, Tuple
+
+# Defaults tuned for template variants: one changed tone word or constraint in a
+# short CRAFT prompt still scores ~0.9 Jaccard on word 2-grams.
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_AGE_S = 24 * 3600
+NUM_PERM = 64
+BANDS = 16                      # 16 bands x 4 rows: pairs above ~0.6 Jaccard almost always collide
+SHINGLE_WORDS = 2
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _perm_params(num_perm: int) -> List[Tuple[int, int]]:
+    # fixed seeds so signatures are stable across runs and persisted caches
+    params = []
+    for i in range(num_perm):
+        d = hashlib.blake2b(f"pbj-minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(d[:8], "little") % _MERSENNE or 1
+        b = int.from_bytes(d[8:], "little") % _MERSENNE
+        params.append((a, b))
+    return params
+
+
+_PERMS = _perm_params(NUM_PERM)
+
+
+# =============================================================
+# Normalization, shingles, signatures
+# =============================================================
+def normalize_prompt(prompt: str) -> str:
+    """Case-fold, unify unicode forms and collapse whitespace/punctuation runs."""
+    text = unicodedata.normalize("NFKC", prompt or "").casefold()
+    return " ".join(re.findall(r"\w+", text))
+
+
+def shingles(normalized: str, k: int = SHINGLE_WORDS) -> Set[str]:
+    words = normalized.split()
+    if len(words) <= k:
+        return {normalized} if normalized else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def _hash32(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little")
+
+
+def minhash(shingle_set: Set[str]) -> Tuple[int, ...]:
+    hashes = [_hash32(s) for s in shingle_set] or [0]
+    return tuple(min(((a * h + b) % _MERSENNE) & _MAX_HASH for h in hashes) for a, b in _PERMS)
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+# =============================================================
+# Cache
+# =============================================================
+@dataclass
+class CacheEntry:
+    provider: str
+    model: str
+    prompt: str
+    response: str
+    created_at: float
+    last_hit_at: float = 0.0
+    hits: int = 0
+
+
+@dataclass
+class CacheHit:
+    """Provenance of a response served from the cache."""
+    response: str
+    similarity: float          # exact Jaccard of normalized word 2-grams, 1.0 = same prompt
+    cached_prompt: str
+    created_at: float
+    hits: int
+
+    def describe(self) -> str:
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.created_at))
+        kind = "identical prompt" if self.similarity >= 1.0 else f"{self.similarity:.0%} similar prompt"
+        return f"Served from cache: {kind} answered {when} (reused {self.hits}×)."
+
+
+class PromptCache:
+    """
+    Approximate response cache keyed by (provider, model, prompt).
+
+    Prompts are normalized and shingled into word 2-grams; a MinHash signature split
+    into LSH bands finds candidates in roughly constant time, and candidates are then
+    scored with exact Jaccard against `threshold`. Entries are evicted least-recently
+    used beyond `max_entries` and after `max_age_s` seconds. With `path` set the cache
+    is persisted as JSON so it survives app restarts.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age_s: Optional[float] = DEFAULT_MAX_AGE_S,
+        path: Optional[str] = None,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_age_s = max_age_s
+        self.path = path
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._shingles: Dict[int, Set[str]] = {}
+        self._bands: Dict[Tuple[str, str, int, Tuple[int, ...]], Set[int]] = {}
+        self._entry_bands: Dict[int, List[Tuple[str, str, int, Tuple[int, ...]]]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hit_count = 0
+        if path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------- index maintenance ----------
+    def _band_keys(self, provider: str, model: str, sig: Tuple[int, ...]) -> List[Tuple[str, str, int, Tuple[int, ...]]]:
+        rows = len(sig) // BANDS
+        return [(provider, model, b, sig[b * rows:(b + 1) * rows]) for b in range(BANDS)]
+
+    def _add(self, entry: CacheEntry) -> int:
+        eid = self._next_id
+        self._next_id += 1
+        sh = shingles(normalize_prompt(entry.prompt))
+        keys = self._band_keys(entry.provider, entry.model, minhash(sh))
+        for key in keys:
+            self._bands.setdefault(key, set()).add(eid)
+        self._entries[eid] = entry
+        self._shingles[eid] = sh
+        self._entry_bands[eid] = keys
+        return eid
+
+    def _remove(self, eid: int) -> None:
+        for key in self._entry_bands.pop(eid, []):
+            bucket = self._bands.get(key)
+            if bucket is not None:
+                bucket.discard(eid)
+                if not bucket:
+                    del self._bands[key]
+        self._entries.pop(eid, None)
+        self._shingles.pop(eid, None)
+
+    def _evict(self, now: float) -> None:
+        if self.max_age_s is not None:
+            for eid in [e for e, v in self._entries.items() if now - v.created_at > self.max_age_s]:
+                self._remove(eid)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    # ---------- public API ----------
+    def lookup(self, provider: str, model: str, prompt: str, threshold: Optional[float] = None) -> Optional[CacheHit]:
+        """
+        Best cached response within `threshold` for this provider/model, or None.
+        `threshold` overrides the cache's default, so callers sharing one cache can differ.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        sh = shingles(normalize_prompt(prompt))
+        with self._lock:
+            now = time.time()
+            self._evict(now)
+            self.lookups += 1
+            candidates: Set[int] = set()
+            for key in self._band_keys(provider, model, minhash(sh)):
+                candidates |= self._bands.get(key, set())
+
+            best_id, best_sim = None, -1.0
+            for eid in candidates:
+                sim = jaccard(sh, self._shingles[eid])
+                if sim > best_sim:
+                    best_id, best_sim = eid, sim
+            if best_id is None or best_sim < threshold:
+                return None
+
+            entry = self._entries[best_id]
+            entry.hits += 1
+            entry.last_hit_at = now
+            self._entries.move_to_end(best_id)
+            self.hit_count += 1
+            return CacheHit(entry.response, best_sim, entry.prompt, entry.created_at, entry.hits)
+
+    def store(self, provider: str, model: str, prompt: str, response: str) -> None:
+        if not response:
+            return
+        with self._lock:
+            now = time.time()
+            # a fresh answer to the same normalized prompt replaces the old one
+            norm = normalize_prompt(prompt)
+            for eid, e in list(self._entries.items()):
+                if e.provider == provider and e.model == model and normalize_prompt(e.prompt) == norm:
+                    self._remove(eid)
+            self._add(CacheEntry(provider, model, prompt, response, created_at=now))
+            self._evict(now)
+            self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._shingles.clear()
+            self._bands.clear()
+            self._entry_bands.clear()
+            self._save()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._entries),
+            "lookups": self.lookups,
+            "hits": self.hit_count,
+            "hit_rate": self.hit_count / self.lookups if self.lookups else 0.0,
+        }
+
+    # ---------- persistence ----------
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for d in data if isinstance(data, list) else []:
+                self._add(CacheEntry(**d))
+            self._evict(time.time())
+        except Exception:
+            pass
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        # write-then-rename so a reader (or a crash mid-write) never sees half a file
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([asdict(e) for e in self._entries.values()], f, indent=2, ensure_ascii=False)
+        os.replace(tmp, self.path)
@@ -0,0 +1,166 @@
+# scheduler.py — priority-aware request scheduler shared by LLMClient calls
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+PRIORITIES = ["interactive", "batch", "background"]
+
+
+@dataclass
+class ClassPolicy:
+    weight: float = 1.0                   # share of dispatches under weighted fair queuing
+    max_concurrency: Optional[int] = None  # cap on running requests of this class (None = backend limit)
+    deadline_s: Optional[float] = None     # give up if still queued after this long (None = wait forever)
+
+
+def default_policies(max_concurrency: int) -> Dict[str, ClassPolicy]:
+    # batch and background may never take every slot, so a click always finds one free
+    # once a request ends (or right away when the backend allows more than one call)
+    reserve = max(1, max_concurrency - 1)
+    return {
+        "interactive": ClassPolicy(weight=8.0, deadline_s=300),
+        "batch": ClassPolicy(weight=2.0, max_concurrency=reserve),
+        "background": ClassPolicy(weight=1.0, max_concurrency=1),
+    }
+
+
+class SchedulerTimeout(TimeoutError):
+    """A request waited in the queue past its class deadline."""
+
+
+@dataclass(eq=False)             # compared by identity: queue removal must hit this ticket
+class _Ticket:
+    priority: str
+    finish_tag: float
+    enqueued_at: float
+    deadline_at: Optional[float]
+
+
+@dataclass
+class _ClassStats:
+    queue: Deque[_Ticket] = field(default_factory=deque)
+    running: int = 0
+    completed: int = 0
+    expired: int = 0
+    last_finish: float = 0.0
+    waits: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+
+class RequestScheduler:
+    """
+    Admission control in front of one backend (a llama_cpp server, an OpenAI key).
+
+    Callers block in run() until a slot is free and their request is next. The next
+    request is chosen by weighted fair queuing over the classes (virtual finish tag =
+    max(class's last tag, virtual time) + 1/weight), within each class first come first
+    served. While interactive requests are waiting, queued batch and background work is
+    deferred; requests already running are never interrupted. Per-class concurrency caps
+    and queue deadlines come from `policies`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 1,
+        policies: Optional[Dict[str, ClassPolicy]] = None,
+        defer_to_interactive: bool = True,
+    ):
+        self.max_concurrency = max_concurrency
+        self.policies = policies or default_policies(max_concurrency)
+        self.defer_to_interactive = defer_to_interactive
+        self._stats: Dict[str, _ClassStats] = {p: _ClassStats() for p in self.policies}
+        self._virtual_time = 0.0
+        self._cond = threading.Condition()
+
+    # ---------- dispatch ----------
+    def _running(self) -> int:
+        return sum(s.running for s in self._stats.values())
+
+    def _eligible(self, priority: str) -> bool:
+        s = self._stats[priority]
+        cap = self.policies[priority].max_concurrency
+        return bool(s.queue) and (cap is None or s.running < cap)
+
+    def _next(self) -> Optional[_Ticket]:
+        if self._running() >= self.max_concurrency:
+            return None
+        classes = [p for p in self._stats if self._eligible(p)]
+        if self.defer_to_interactive and "interactive" in classes:
+            classes = ["interactive"]
+        if not classes:
+            return None
+        return min((self._stats[p].queue[0] for p in classes), key=lambda t: t.finish_tag)
+
+    def _expire(self, now: float) -> None:
+        for s in self._stats.values():
+            for t in [t for t in s.queue if t.deadline_at is not None and now >= t.deadline_at]:
+                s.queue.remove(t)
+                s.expired += 1
+
+    # ---------- public API ----------
+    def run(self, fn: Callable[[], Any], priority: str = "interactive", deadline_s: Optional[float] = None) -> Any:
+        """
+        Wait for a slot, then call fn(). `deadline_s` overrides the class deadline;
+        SchedulerTimeout is raised if the request is still queued when it passes.
+        """
+        if priority not in self.policies:
+            raise ValueError(f"Unknown priority '{priority}'. Choose from {list(self.policies)}.")
+        policy = self.policies[priority]
+        deadline_s = policy.deadline_s if deadline_s is None else deadline_s
+
+        with self._cond:
+            now = time.monotonic()
+            s = self._stats[priority]
+            s.last_finish = max(s.last_finish, self._virtual_time) + 1.0 / policy.weight
+            ticket = _Ticket(priority, s.last_finish, now, now + deadline_s if deadline_s is not None else None)
+            s.queue.append(ticket)
+
+            try:
+                while self._next() is not ticket:
+                    if ticket.deadline_at is not None:
+                        remaining = ticket.deadline_at - time.monotonic()
+                        if remaining <= 0:
+                            self._expire(time.monotonic())
+                            raise SchedulerTimeout(f"{priority} request waited over {deadline_s:g}s in the queue.")
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+
+                s.queue.popleft()
+                s.running += 1
+                s.waits.append(time.monotonic() - ticket.enqueued_at)
+                self._virtual_time = max(self._virtual_time, ticket.finish_tag - 1.0 / policy.weight)
+            finally:
+                # a waiter that gave up (timeout, KeyboardInterrupt, Streamlit stopping the
+                # script) must not leave its ticket blocking the head of the queue
+                if ticket in s.queue:
+                    s.queue.remove(ticket)
+                self._cond.notify_all()  # another slot may still be free for the next ticket
+
+        try:
+            return fn()
+        finally:
+            with self._cond:
+                s.running -= 1
+                s.completed += 1
+                self._cond.notify_all()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-class queue depth, running count, totals and wait times (seconds, recent requests)."""
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._cond:
+            now = time.monotonic()
+            for p, s in self._stats.items():
+                waits: List[float] = sorted(s.waits)
+                oldest = now - s.queue[0].enqueued_at if s.queue else 0.0
+                out[p] = {
+                    "queued": len(s.queue),
+                    "running": s.running,
+                    "completed": s.completed,
+                    "expired": s.expired,
+                    "oldest_wait_s": round(oldest, 2),
+                    "avg_wait_s": round(sum(waits) / len(waits), 2) if waits else 0.0,
+                    "p95_wait_s": round(waits[min(len(waits) - 1, int(0.95 * len(waits)))], 2) if waits else 0.0,
+                }
+        return out
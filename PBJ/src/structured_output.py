@@ -0,0 +1,182 @@
+# structured_output.py — JSON Schema output mode: request formats + streaming validation
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+try:
+    import jsonschema
+except Exception:
+    jsonschema = None
+
+# used when a template only asks for "JSON" without attaching a schema
+ANY_JSON_OBJECT: Dict[str, Any] = {"type": "object"}
+
+
+class StructuredOutputError(ValueError):
+    """The model's output is not valid JSON or does not match the attached schema."""
+
+
+def schema_fingerprint(schema: Dict[str, Any]) -> str:
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode()).hexdigest()[:12]
+
+
+# =============================================================
+# Provider request fields
+# =============================================================
+def openai_response_format(schema: Dict[str, Any], name: str = "pbj_output") -> Dict[str, Any]:
+    """OpenAI `response_format`: plain JSON mode for an open object, json_schema otherwise."""
+    if schema == ANY_JSON_OBJECT:
+        return {"type": "json_object"}
+    # the API only accepts names matching [a-zA-Z0-9_-]{1,64}
+    title = re.sub(r"[^a-zA-Z0-9_-]+", "_", str(schema.get("title") or "")).strip("_")[:64]
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": title or name, "schema": schema, "strict": False},
+    }
+
+
+def local_http_constraints(schema: Dict[str, Any], grammar: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Payload fields for llama_cpp.server: an explicit GBNF `grammar` wins, otherwise the
+    schema goes in `response_format` and the server compiles it into a grammar.
+    """
+    if grammar:
+        return {"grammar": grammar}
+    return {"response_format": {"type": "json_object", "schema": schema}}
+
+
+# =============================================================
+# Streaming validation
+# =============================================================
+class JsonStreamValidator:
+    """
+    Follows a streamed reply character by character and finds the JSON value in it.
+
+    Bracket nesting and string/escape state are tracked per character. When a
+    candidate value starting at '{' or '[' closes it is parsed and checked against
+    the schema; if both pass, `complete` turns True so the caller can stop generating
+    right there. If not (a preamble like "Step [1]: {...}", mismatched brackets, or
+    a value of the wrong shape) the scan restarts after that opening bracket.
+    """
+
+    def __init__(self, schema: Optional[Dict[str, Any]] = None):
+        self.schema = schema
+        self._raw = ""
+        self._pos = 0             # next character of _raw to scan
+        self._start = -1          # where the current candidate value begins
+        self._value: Any = None
+        self._errors: List[str] = []   # schema errors of the last candidate that parsed
+        self._reset()
+        self.complete = False
+
+    def _reset(self) -> None:
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+
+    def _restart(self) -> None:
+        self._pos = self._start + 1
+        self._start = -1
+        self._reset()
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk; returns True once a complete, parseable JSON value was seen."""
+        if self.complete:
+            return True
+        self._raw += chunk
+        while self._pos < len(self._raw) and not self.complete:
+            ch = self._raw[self._pos]
+            self._pos += 1
+            if self._start < 0:
+                if ch in "{[":
+                    self._start = self._pos - 1
+                    self._stack.append("}" if ch == "{" else "]")
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._stack.append("}" if ch == "{" else "]")
+            elif ch in "}]":
+                if self._stack.pop() != ch:
+                    self._restart()
+                elif not self._stack:
+                    self._check_candidate()
+        return self.complete
+
+    def _check_candidate(self) -> None:
+        try:
+            value = json.loads(self._raw[self._start:self._pos])
+        except json.JSONDecodeError:
+            self._restart()
+            return
+        errors = validate(value, self.schema) if self.schema else []
+        if errors:
+            self._errors = errors
+            self._restart()
+            return
+        self._value = value
+        self.complete = True
+
+    @property
+    def text(self) -> str:
+        """The JSON value (once complete), without any text around it."""
+        return self._raw[self._start:self._pos] if self.complete else ""
+
+    def result(self) -> Any:
+        """The validated value; raises StructuredOutputError if the stream held none."""
+        if not self.complete:
+            if self._start >= 0:
+                raise StructuredOutputError("The JSON output was cut off before it was complete.")
+            if self._errors:
+                raise StructuredOutputError("Output does not match the schema: " + "; ".join(self._errors[:5]))
+            raise StructuredOutputError("The model did not return any valid JSON.")
+        return self._value
+
+
+_JSON_TYPES = {
+    "object": dict, "array": list, "string": str, "boolean": bool,
+    "integer": int, "number": (int, float), "null": type(None),
+}
+
+
+def _basic_errors(value: Any, schema: Dict[str, Any], path: str) -> List[str]:
+    # fallback when jsonschema is not installed: type, required, properties and items only
+    errors: List[str] = []
+    types = schema.get("type")
+    if types:
+        types = types if isinstance(types, list) else [types]
+        ok = any(isinstance(value, _JSON_TYPES.get(t, object)) and not
+                 (t in ("integer", "number") and isinstance(value, bool)) for t in types)
+        if not ok:
+            return [f"{path or '$'}: expected {'/'.join(types)}"]
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path or '$'}: not one of {schema['enum']}")
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path or '$'}: missing required '{key}'")
+        for key, sub in schema.get("properties", {}).items():
+            if key in value:
+                errors += _basic_errors(value[key], sub, f"{path}.{key}" if path else key)
+    if isinstance(value, list) and isinstance(schema.get("items"), dict):
+        for i, item in enumerate(value):
+            errors += _basic_errors(item, schema["items"], f"{path}[{i}]")
+    return errors
+
+
+def validate(value: Any, schema: Dict[str, Any]) -> List[str]:
+    """List of validation errors (empty when valid); uses jsonschema when available."""
+    if jsonschema is None:
+        return _basic_errors(value, schema, "")
+    validator = jsonschema.validators.validator_for(schema)(schema)
+    return [f"{'.'.join(str(p) for p in e.absolute_path) or '$'}: {e.message}"
+            for e in validator.iter_errors(value)]
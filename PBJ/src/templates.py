@@ -1,12 +1,15 @@
 # pbj_core.py — PBJ core types, registry, and framework specs
+import json
 from dataclasses import dataclass
-from typing import Callable, List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
+
+from structured_output import ANY_JSON_OBJECT
 
 @dataclass
 class FieldSpec:
     key: str
     label: str
-    widget: str = "text"        # "text", "textarea", "examples"
+    widget: str = "text"        # "text", "textarea", "examples", "schema"
     placeholder: str = ""
     help: str = ""
     required: bool = False
@@ -16,12 +19,37 @@ class FrameworkSpec:
     name: str
     fields: List[FieldSpec]
     assemble: Callable[[Dict[str, Any]], str]
+    output_schema: Optional[Dict[str, Any]] = None  # JSON Schema every prompt of this type must follow
+    format_key: Optional[str] = None                # field naming the output format, e.g. "JSON"
 
 FRAMEWORKS: Dict[str, FrameworkSpec] = {}
 
 def register_framework(spec: FrameworkSpec) -> None:
     FRAMEWORKS[spec.name] = spec
 
+def resolve_output_schema(spec: FrameworkSpec, values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    JSON Schema for structured-output mode, or None for free text.
+    A schema pasted into the template wins, then the framework's own schema; a format
+    field that just says JSON asks for any JSON object.
+    """
+    raw = values.get("output_schema")
+    if isinstance(raw, dict):
+        return raw
+    if isinstance(raw, str) and raw.strip():
+        try:
+            schema = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Output JSON Schema is not valid JSON: {e}") from e
+        if not isinstance(schema, dict):
+            raise ValueError("Output JSON Schema must be a JSON object.")
+        return schema
+    if spec.output_schema is not None:
+        return spec.output_schema
+    if spec.format_key and "json" in str(values.get(spec.format_key, "")).lower():
+        return ANY_JSON_OBJECT
+    return None
+
 # ---------- Assemblers ----------
 def assemble_craft(values: Dict[str, Any]) -> str:
     examples = values.get("examples", [])
@@ -87,8 +115,10 @@ register_framework(FrameworkSpec(
         FieldSpec("tone", "Tone", "text", placeholder="professional, friendly, concise"),
         FieldSpec("constraints", "Constraints", "text", placeholder="word limits, exclusions"),
         FieldSpec("examples", "Examples", "examples", help="Few-shot input/output pairs - Enter a list of dictionaries"),
+        FieldSpec("output_schema", "Output JSON Schema", "schema", help="Optional - the model's reply is constrained to and validated against this schema"),
     ],
-    assemble=assemble_craft
+    assemble=assemble_craft,
+    format_key="format"
 ))
 
 register_framework(FrameworkSpec(
@@ -101,8 +131,10 @@ register_framework(FrameworkSpec(
         FieldSpec("parameters", "Parameters", "text", placeholder="length, audience, tone"),
         FieldSpec("time", "Time", "text", placeholder="timeframe / recency"),
         FieldSpec("examples", "Examples", "examples", help="Few-shot input/output pairs - Enter a list of dictionaries"),
+        FieldSpec("output_schema", "Output JSON Schema", "schema", help="Optional - the model's reply is constrained to and validated against this schema"),
     ],
-    assemble=assemble_prompt
+    assemble=assemble_prompt,
+    format_key="output"
 ))
 
 register_framework(FrameworkSpec(
@@ -112,6 +144,7 @@ register_framework(FrameworkSpec(
         FieldSpec("audience", "Audience", "text", placeholder="Who will read/use this?"),
         FieldSpec("purpose", "Purpose", "text", placeholder="Why are we doing this?"),
         FieldSpec("examples", "Examples", "examples", help="Few-shot input/output pairs - Enter a list of dictionaries"),
+        FieldSpec("output_schema", "Output JSON Schema", "schema", help="Optional - the model's reply is constrained to and validated against this schema"),
     ],
     assemble=assemble_tap
 ))
@@ -0,0 +1,5 @@
+# lets `pytest` run from PBJ/ or the repo root and import modules the way pbj.py does
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,48 @@
+import json
+
+from prompt_cache import PromptCache
+
+PROMPT = "Write a short formal email to the team announcing the product launch on Monday"
+
+
+def test_near_duplicate_hits_and_unrelated_prompt_misses():
+    cache = PromptCache(threshold=0.8)
+    cache.store("openai", "gpt-4o-mini", PROMPT, "Dear team, ...")
+
+    hit = cache.lookup("openai", "gpt-4o-mini", "  write a short FORMAL email to the team announcing the product launch on monday!")
+    assert hit is not None and hit.response == "Dear team, ..." and hit.similarity == 1.0
+
+    variant = PROMPT.replace("formal", "friendly")
+    assert cache.lookup("openai", "gpt-4o-mini", variant, threshold=0.99) is None
+    assert cache.lookup("openai", "gpt-4o-mini", variant, threshold=0.5) is not None
+
+    assert cache.lookup("openai", "other-model", PROMPT) is None
+    assert cache.lookup("openai", "gpt-4o-mini", "Summarize this quarterly sales report in three bullets") is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_persistence_round_trip(tmp_path):
+    path = tmp_path / "prompt_cache.json"
+    cache = PromptCache(path=str(path))
+    cache.store("local_http", "llama", PROMPT, "first")
+    cache.store("local_http", "llama", PROMPT, "second")      # replaces the older answer
+    assert len(json.loads(path.read_text(encoding="utf-8"))) == 1
+
+    reloaded = PromptCache(path=str(path))
+    assert len(reloaded) == 1
+    assert reloaded.lookup("local_http", "llama", PROMPT).response == "second"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_lru_and_age_eviction():
+    cache = PromptCache(max_entries=2, max_age_s=None)
+    for i, word in enumerate(["alpha", "bravo", "charlie"]):
+        cache.store("p", "m", f"explain the {word} release process in detail", str(i))
+    assert len(cache) == 2
+    assert cache.lookup("p", "m", "explain the alpha release process in detail", threshold=0.99) is None
+
+    aged = PromptCache(max_age_s=60)
+    aged.store("p", "m", PROMPT, "old")
+    for entry in aged._entries.values():
+        entry.created_at -= 120
+    assert aged.lookup("p", "m", PROMPT) is None
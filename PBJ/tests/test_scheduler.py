@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from scheduler import RequestScheduler, SchedulerTimeout
+
+
+def _hold_slot(sched):
+    """Occupy the only slot until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+
+    t = threading.Thread(target=sched.run, args=(job, "interactive"))
+    t.start()
+    started.wait(5)
+    return release, t
+
+
+def _wait_queued(sched, n):
+    deadline = time.monotonic() + 5
+    while sum(m["queued"] for m in sched.metrics().values()) < n:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_interactive_runs_first_then_weighted_fair_order():
+    sched = RequestScheduler(max_concurrency=1)
+    release, holder = _hold_slot(sched)
+    order, threads = [], []
+    for i, priority in enumerate(["background", "batch", "interactive"]):
+        t = threading.Thread(target=sched.run, args=(lambda p=priority: order.append(p), priority))
+        t.start()
+        threads.append(t)
+        _wait_queued(sched, i + 1)
+
+    release.set()
+    for t in [holder, *threads]:
+        t.join(5)
+    assert order == ["interactive", "batch", "background"]
+
+
+def test_queued_request_expires_at_its_deadline():
+    sched = RequestScheduler(max_concurrency=1)
+    release, holder = _hold_slot(sched)
+    with pytest.raises(SchedulerTimeout):
+        sched.run(lambda: None, "batch", deadline_s=0.05)
+    release.set()
+    holder.join(5)
+    metrics = sched.metrics()["batch"]
+    assert (metrics["queued"], metrics["expired"], metrics["completed"]) == (0, 1, 0)
+
+
+def test_abandoned_waiter_does_not_block_the_queue(monkeypatch):
+    sched = RequestScheduler(max_concurrency=1)
+    release, holder = _hold_slot(sched)
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(sched._cond, "wait", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        sched.run(lambda: None, "interactive")
+    monkeypatch.undo()
+
+    assert sched.metrics()["interactive"]["queued"] == 0
+    release.set()
+    holder.join(5)
+    assert sched.run(lambda: "ran", "interactive") == "ran"
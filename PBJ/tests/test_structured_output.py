@@ -0,0 +1,37 @@
+import pytest
+
+from structured_output import JsonStreamValidator, StructuredOutputError, openai_response_format
+
+SCHEMA = {"type": "object", "required": ["a"], "properties": {"a": {"type": "integer"}}}
+
+
+def _stream(chunks, schema=SCHEMA):
+    validator = JsonStreamValidator(schema)
+    for chunk in chunks:
+        if validator.feed(chunk):
+            break
+    return validator
+
+
+def test_bracketed_preamble_that_fails_the_schema_is_skipped():
+    validator = _stream(['Step [1]: {"a"', ": 1}", " trailing"])
+    assert validator.result() == {"a": 1}
+    assert validator.text == '{"a": 1}'
+
+
+def test_preamble_that_does_not_parse_is_skipped():
+    assert _stream(['Sure! Here [is] the JSON: {"a":1}']).result() == {"a": 1}
+
+
+def test_schema_mismatch_and_truncation_are_reported():
+    with pytest.raises(StructuredOutputError, match="does not match the schema"):
+        _stream(['{"b": 1}']).result()
+    with pytest.raises(StructuredOutputError, match="cut off"):
+        _stream(['{"a": 1']).result()
+
+
+def test_openai_schema_name_is_sanitized():
+    schema = {"title": "Résumé summary (v2)!", "type": "object", "properties": {}}
+    name = openai_response_format(schema)["json_schema"]["name"]
+    assert name == "R_sum_summary_v2"
+    assert openai_response_format({**schema, "title": "!!!"})["json_schema"]["name"] == "pbj_output"